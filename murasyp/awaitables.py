@@ -0,0 +1,177 @@
+"""Awaitable queries for use with :mod:`asyncio`
+
+The calculations behind queries such as lower previsions or consistency
+checks can take a long time. The awaitable variants defined here run them in
+an executor (by default, the event loop's default thread pool; a
+:class:`~concurrent.futures.ProcessPoolExecutor` can be passed instead), so
+that the event loop is not blocked. They support timeouts and cancellation,
+and concurrent identical requests are coalesced into a single calculation.
+
+"""
+import asyncio
+import functools
+from murasyp.vectors import Polytope
+import murasyp.mathprog
+
+class AsyncModel(object):
+    """Awaitable queries about a model
+
+      :arg `model`: the model that is queried
+      :type `model`: a :class:`~murasyp.desirs.DesirSet` or
+        :class:`~murasyp.credalsets.CredalSet`
+      :arg `executor`: the executor in which the calculations are run (by
+        default, the event loop's default executor)
+      :type `executor`: :class:`~concurrent.futures.Executor`
+      :arg `timeout`: the default timeout in seconds (by default, none)
+      :type `timeout`: :class:`float`
+
+    Each query works on a snapshot of the model taken when the calculation is
+    started, so the model may be changed in the meantime. The snapshot is a
+    copy of the model that is shared by all queries made until the model is
+    changed, so that what the copy keeps between calculations (such as the
+    compiled model of a :class:`~murasyp.desirs.DesirSet`) is reused.
+    Identical queries about the same state of the model that are in flight at
+    the same time share a single calculation.
+
+    >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+    ...                Gamble({'a': 1, 'c': '-1/30'}),
+    ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+    ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+    >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+    >>> async def queries():
+    ...     model = AsyncModel(D)
+    ...     results = await asyncio.gather(model.lower_prevision(f),
+    ...                                    model.lower_prevision(f),
+    ...                                    model.upper_prevision(f),
+    ...                                    model.apl())
+    ...     return results, model.coalesced
+    >>> asyncio.run(queries())
+    ([Fraction(-1, 25), Fraction(-1, 25), Fraction(1, 25), True], 1)
+
+    Sequential queries about an unchanged model reuse the same copy:
+
+    >>> async def sequential():
+    ...     model = AsyncModel(D)
+    ...     await model.lower_prevision(f)
+    ...     copy = model._copy
+    ...     await model.upper_prevision(f)
+    ...     return model._copy is copy
+    >>> asyncio.run(sequential())
+    True
+
+    When a query is cancelled or times out, the shared calculation is
+    cancelled as well if no other query is waiting for it (a calculation that
+    has already started in a thread cannot be interrupted, however; its
+    result is then discarded).
+
+    """
+    def __init__(self, model, executor=None, timeout=None):
+        self.model = model
+        self.executor = executor
+        self.timeout = timeout
+        self.coalesced = 0 # number of queries that joined a calculation
+        self._in_flight = {}
+        self._contents = None # the contents of the last snapshot
+        self._copy = None # the last snapshot of the model
+
+    async def _query(self, method, arg=None, timeout=None):
+        """Run a query in the executor, coalescing identical ones"""
+        loop = asyncio.get_running_loop()
+        contents, copy = self._snapshot()
+        key = (method, contents, arg)
+        entry = self._in_flight.get(key)
+        if entry is None:
+            call = getattr(copy, method)
+            future = loop.run_in_executor(
+                        self.executor,
+                        call if arg is None else functools.partial(call, arg))
+            entry = [future, 0]
+            self._in_flight[key] = entry
+            future.add_done_callback(
+                lambda future: self._forget(key, entry))
+        else:
+            self.coalesced += 1
+        entry[1] += 1
+        try:
+            return await asyncio.wait_for(
+                            asyncio.shield(entry[0]),
+                            self.timeout if timeout is None else timeout)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not entry[0].done():
+                entry[0].cancel()
+                self._forget(key, entry)
+
+    def _snapshot(self):
+        """The frozen contents of the model and a copy of it, shared by the
+        queries made while the model is not changed"""
+        if self._contents is None or self._contents != self.model:
+            self._contents = frozenset(self.model)
+            self._copy = type(self.model)(self._contents)
+        return self._contents, self._copy
+
+    def _forget(self, key, entry):
+        """Stop coalescing queries into a calculation"""
+        if self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    async def lower_prevision(self, gamble, timeout=None):
+        """Lower prevision (expectation) of a gamble
+
+          :type `gamble`: :class:`~murasyp.gambles.Gamble`
+          :arg `timeout`: the timeout in seconds (by default, the pool's)
+          :type `timeout`: :class:`float`
+
+        """
+        return await self._query('__mul__', gamble, timeout)
+
+    async def upper_prevision(self, gamble, timeout=None):
+        """Upper prevision (expectation) of a gamble
+
+          :type `gamble`: :class:`~murasyp.gambles.Gamble`
+          :arg `timeout`: the timeout in seconds (by default, the pool's)
+          :type `timeout`: :class:`float`
+
+        """
+        return await self._query('__pow__', gamble, timeout)
+
+    async def asl(self, timeout=None):
+        """Whether the model avoids sure loss (see
+        :meth:`~murasyp.desirs.DesirSet.asl`)"""
+        return await self._query('asl', timeout=timeout)
+
+    async def apl(self, timeout=None):
+        """Whether the model avoids partial loss (see
+        :meth:`~murasyp.desirs.DesirSet.apl`)"""
+        return await self._query('apl', timeout=timeout)
+
+    async def get_credal(self, timeout=None):
+        """The corresponding credal set (see
+        :meth:`~murasyp.desirs.DesirSet.get_credal`)"""
+        return await self._query('get_credal', timeout=timeout)
+
+
+async def vf_enumeration(data=[], executor=None, timeout=None):
+    """Awaitable vertex/facet enumeration
+
+      :type `data`: an argument accepted by the
+        :class:`~murasyp.vectors.Polytope` constructor.
+      :arg `executor`: the executor in which the enumeration is run (by
+        default, the event loop's default executor)
+      :type `executor`: :class:`~concurrent.futures.Executor`
+      :arg `timeout`: the timeout in seconds (by default, none)
+      :type `timeout`: :class:`float`
+
+    See :func:`~murasyp.mathprog.vf_enumeration`.
+
+    >>> P = Polytope([{'a': 1}, {'b': 1}])
+    >>> assert (asyncio.run(vf_enumeration(P))
+    ...         == murasyp.mathprog.vf_enumeration(P))
+
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+                    loop.run_in_executor(executor,
+                                         murasyp.mathprog.vf_enumeration,
+                                         Polytope(data)),
+                    timeout)
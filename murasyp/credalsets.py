@@ -1,7 +1,11 @@
 from collections import Mapping
+from fractions import Fraction
+from itertools import islice, product
 from cdd import Matrix, RepType
+from murasyp.functions import _common_denominator
+from murasyp.vectors import PossibilitySpace
 from murasyp.massfuncs import PMFunc
-from murasyp.gambles import Gamble, Ray
+from murasyp.gambles import Gamble, ProductGamble, Ray
 import murasyp.desirs
 import murasyp.mathprog
 
@@ -75,6 +79,16 @@ class CredalSet(set):
                             + " but you passed it " + str(data))
         else:
             set.__init__(self, (PMFunc(element) for element in data))
+        self._changed()
+
+    def __reduce__(self): # what was calculated is not pickled
+        return (type(self), (list(self),))
+
+    def _changed(self):
+        """Forget what was calculated for the credal set"""
+        self._conversion = None # the double description of the set of gambles
+        self._matrix = None # the integer matrix of the mass functions
+        self._facets = None # the integer matrix of the facet inequalities
 
     def add(self, data):
         """Add a probability mass function to the credal set
@@ -95,7 +109,21 @@ class CredalSet(set):
             see whether all set functionality is carried over
 
         """
-        set.add(self, PMFunc(data))
+        p = PMFunc(data)
+        set.add(self, p)
+        self._matrix = self._facets = None
+        if self._conversion is not None:
+            self._conversion.add_inequality(p)
+
+    def update(self, *others):
+        """Add the probability mass functions of other credal sets"""
+        for other in others:
+            for element in other:
+                self.add(element)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
     def discard(self, data):
         """Remove a probability mass function from the credal set
@@ -114,6 +142,46 @@ class CredalSet(set):
 
         """
         set.discard(self, PMFunc(data))
+        self._changed()
+
+    def remove(self, data):
+        """Remove a probability mass function, which must be present, from the
+        credal set (see :meth:`discard`)"""
+        set.remove(self, PMFunc(data))
+        self._changed()
+
+    def pop(self):
+        p = set.pop(self)
+        self._changed()
+        return p
+
+    def clear(self):
+        set.clear(self)
+        self._changed()
+
+    def difference_update(self, *others):
+        set.difference_update(self, *others)
+        self._changed()
+
+    def intersection_update(self, *others):
+        set.intersection_update(self, *others)
+        self._changed()
+
+    def symmetric_difference_update(self, other):
+        set.symmetric_difference_update(self, other)
+        self._changed()
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
 
     def __or__(self, other):
         """Credal set conditional on the given event"""
@@ -129,23 +197,102 @@ class CredalSet(set):
     def __mul__(self, other):
         """Lower expectation of a gamble"""
         if isinstance(other, Gamble):
-            if len(self) == 0:
-                raise Error("Empty credal sets have no expectations")
-            else:
-                return min(p * other for p in self)
+            return self.lower_previsions([other])[0]
         else:
             raise TypeError(str(other) + " is not a gamble")
 
     def __pow__(self, other):
         """Upper expectation of a gamble"""
         if isinstance(other, Gamble):
-            if len(self) == 0:
-                raise Error("Empty credal sets have no expectations")
-            else:
-                return max(p * other for p in self)
+            return self.upper_previsions([other])[0]
         else:
             raise TypeError(str(other) + " is not a gamble")
 
+    def _array(self):
+        """The possibility space and the integer matrix whose rows are
+        proportional to the probability mass functions"""
+        if self._matrix is None:
+            pspace = PossibilitySpace(self.pspace())
+            self._matrix = (pspace, [p.array(pspace)[0] for p in self])
+        return self._matrix
+
+    def _previsions(self, gambles, upper):
+        """Lower or upper previsions of several gambles"""
+        if len(self) == 0:
+            raise ValueError("Empty credal sets have no expectations")
+        pspace, rows = self._array()
+        events = {} # the columns and row masses of each conditioning event
+        previsions = []
+        for gamble in gambles:
+            gamble = Gamble(gamble)
+            domain = gamble.domain()
+            if domain not in events:
+                columns = [x for x in domain if x in pspace]
+                indices = [pspace.index(x) for x in columns]
+                masses = [sum(row[j] for j in indices) for row in rows]
+                events[domain] = (columns, indices, masses)
+            columns, indices, masses = events[domain]
+            values, denominator = _common_denominator(gamble[x]
+                                                      for x in columns)
+            best = None
+            for row, mass in zip(rows, masses):
+                if mass == 0: # the event lies outside the mass function's
+                    value, mass = 0, 1 # support; it contributes zero
+                else:
+                    value = sum(row[j] * v for j, v in zip(indices, values)
+                                           if v != 0)
+                if (best is None or
+                    (value * best[1] > best[0] * mass if upper
+                     else value * best[1] < best[0] * mass)):
+                    best = (value, mass)
+            previsions.append(Fraction(best[0], best[1] * denominator))
+        return previsions
+
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the lower previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        The probability mass functions are kept as the rows of an integer
+        matrix over a fixed enumeration of the possibility space (until the
+        credal set is changed). Conditioning on the domain of each gamble is
+        done for all rows at once, and only once for all gambles with the same
+        domain; each expectation is then an integer inner product, and
+        expectations are compared without forming fractions.
+
+        >>> p = PMFunc({'a': .03, 'b': .07, 'c': .9})
+        >>> q = PMFunc({'a': .07, 'b': .03, 'c': .9})
+        >>> K = CredalSet([p, q])
+        >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+        >>> K.lower_previsions([f, f | f.support(), -f])
+        [Fraction(-1, 25), Fraction(-2, 5), Fraction(-1, 25)]
+
+        """
+        return self._previsions(gambles, False)
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the upper previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        See :meth:`lower_previsions`.
+
+        >>> p = PMFunc({'a': .03, 'b': .07, 'c': .9})
+        >>> q = PMFunc({'a': .07, 'b': .03, 'c': .9})
+        >>> K = CredalSet([p, q])
+        >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+        >>> K.upper_previsions([f, f | f.support()])
+        [Fraction(1, 25), Fraction(2, 5)]
+
+        """
+        return self._previsions(gambles, True)
+
     def pspace(self):
         """The possibility space of the credal set
 
@@ -161,9 +308,15 @@ class CredalSet(set):
         """
         return frozenset.union(*(p.domain() for p in self))
 
-    def discard_redundant(self):
+    def discard_redundant(self, executor=None):
         """Remove redundant elements from the credal set
 
+          :arg `executor`: an executor in which the exact checks of step 3
+            (below) are run, e.g., a
+            :class:`~concurrent.futures.ProcessPoolExecutor` (by default, they
+            are run sequentially)
+          :type `executor`: :class:`~concurrent.futures.Executor`
+
         Redundant elements are those that are not vertices of the credal set's
         convex hull.
 
@@ -183,15 +336,164 @@ class CredalSet(set):
         ...         {PMFunc({'a': 1}), PMFunc({'b': 1}), PMFunc({'c': 1})})
         ... )
 
+        The result is that of an exact calculation, but most of the work is
+        done in floating-point arithmetic:
+
+        1. The elements that are clearly redundant are found using
+           floating-point arithmetic.
+        2. The vertices among the others are determined exactly.
+        3. The facets of the convex hull of these vertices are determined
+           exactly, and the elements found to be redundant in step 1 are
+           compared with them in floating-point arithmetic. Those that are
+           clearly inside or outside the convex hull are settled; only those
+           close to its boundary are checked exactly (see
+           :func:`~murasyp.mathprog.in_convex_hull`). If some elements lie
+           outside, the vertices among them and the vertices of step 2 are
+           determined exactly.
+
         """
         pspace = list(self.pspace())
         K = list(self)
-        mat = Matrix(list([1] + list(p[x] for x in pspace) for p in K),
-                     number_type='fraction')
+        redundant = sorted(self._redundant(pspace, K, 'float'))
+        vertices = self._vertices(pspace, K, [i for i in range(len(K))
+                                              if i not in frozenset(redundant)])
+        V = [K[i] for i in vertices]
+        outside, borderline = self._margins(CredalSet(V),
+                                            [K[i] for i in redundant])
+        outside = [redundant[n] for n in outside]
+        borderline = [redundant[n] for n in borderline]
+        if executor is None:
+            inside = [murasyp.mathprog.in_convex_hull(K[i], V)
+                      for i in borderline]
+        else:
+            inside = executor.map(murasyp.mathprog.in_convex_hull,
+                                  [K[i] for i in borderline],
+                                  len(borderline) * [V])
+        outside += [i for i, ok in zip(borderline, inside) if not ok]
+        if outside != []: # the convex hull must include these as well
+            vertices = self._vertices(pspace, K, vertices + outside)
+        vertices = frozenset(vertices)
+        for i in range(len(K)):
+            if i not in vertices:
+                set.discard(self, K[i]) # the convex hull does not change
+        self._matrix = None
+
+    @staticmethod
+    def _margins(hull, K, tolerance=1e-9):
+        """The indices of the mass functions that are clearly outside the
+        convex hull of a credal set, and of those close to its boundary
+
+        The facets of the convex hull are exact; only their values for the mass
+        functions are calculated in floating-point arithmetic, relative to the
+        size of the facet.
+
+        """
+        pspace, facets = hull._hrep()
+        facets = [([float(a) for a in facet],
+                   sum(abs(a) for a in facet)) for facet in facets]
+        outside = []
+        borderline = []
+        for n, p in enumerate(K):
+            if not p.domain() <= pspace:
+                outside.append(n)
+                continue
+            values = [float(p[x]) for x in pspace.states]
+            margin = min([sum(a * value for a, value in zip(facet, values))
+                          / size for facet, size in facets] or [1])
+            if margin < -tolerance:
+                outside.append(n)
+            elif margin <= tolerance:
+                borderline.append(n)
+        return outside, borderline
+
+    @classmethod
+    def _vertices(cls, pspace, K, candidates):
+        """The candidates that are vertices of their convex hull, exactly"""
+        red = cls._redundant(pspace, [K[i] for i in candidates], 'fraction')
+        return [i for n, i in enumerate(candidates) if n not in red]
+
+    @staticmethod
+    def _redundant(pspace, K, number_type):
+        """The indices of the mass functions that are not vertices"""
+        if len(K) < 2:
+            return frozenset()
+        convert = float if number_type == 'float' else lambda value: value
+        mat = Matrix(list([1] + list(convert(p[x]) for x in pspace) for p in K),
+                     number_type=number_type)
         mat.rep_type = RepType.GENERATOR
         lin, red = mat.canonicalize()
-        for i in red:
-            self.discard(K[i])
+        return red
+
+    def _hrep(self):
+        """The possibility space and the integer matrix whose rows are the
+        facet inequalities of the credal set"""
+        if self._facets is None:
+            if self._conversion is None:
+                self._conversion = murasyp.mathprog.DoubleDescription(self)
+            pspace = PossibilitySpace(self.pspace())
+            self._facets = (pspace, [ray.array(pspace)[0] for ray
+                                     in self._conversion.generators()])
+        return self._facets
+
+    def includes(self, data):
+        """Check whether a probability mass function lies in the convex hull
+
+          :type `data`: arguments accepted by the
+            :class:`~murasyp.massfuncs.PMFunc` constructor
+          :rtype: :class:`bool`
+
+        The facets of the convex hull of the credal set are calculated once (see
+        :meth:`get_desir`) and kept as the rows of an integer matrix until the
+        credal set is changed; checking inclusion then only requires
+        checking the sign of one inner product per facet.
+
+        >>> K = CredalSet('ab')
+        >>> K.includes({'a': 1, 'b': 3})
+        True
+        >>> K.includes({'a': 1, 'c': 1})
+        False
+
+        """
+        return self.includes_batch([data])[0]
+
+    def includes_batch(self, data):
+        """Check for several probability mass functions whether they lie in the
+        convex hull (see :meth:`includes`)
+
+          :type `data`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.massfuncs.PMFunc` constructor
+          :rtype: :class:`list` of :class:`bool`
+
+        >>> K = CredalSet([{'a': 1, 'b': 1}, {'b': 1, 'c': 1}, 'a', 'c'])
+        >>> K.includes_batch(['abc', 'b', {'a': 2, 'b': 1, 'c': 1}])
+        [True, False, True]
+
+        """
+        if len(self) == 0:
+            return [False for p in data]
+        pspace, facets = self._hrep()
+        included = []
+        for p in data:
+            p = PMFunc(p)
+            if not p.domain() <= pspace:
+                included.append(False)
+                continue
+            numerators = p.array(pspace)[0]
+            included.append(all(sum(a * n for a, n in zip(facet, numerators)
+                                        if n != 0) >= 0
+                                for facet in facets))
+        return included
+
+    def strong_product(self, *others):
+        """The strong product of the credal set with other credal sets
+
+          :type `others`: :class:`~murasyp.credalsets.CredalSet`
+          :returns: the joint model in which the variables described by the
+            credal sets (in order) are strongly independent
+          :rtype: :class:`~murasyp.credalsets.StrongProduct`
+
+        """
+        return StrongProduct((self,) + others)
 
     def get_desir(self):
         """Generate the corresponding open set of desirable gambles
@@ -207,5 +509,304 @@ class CredalSet(set):
         ...                     Ray({'a': 1, 'c': 1, 'b': -1})})})
         ... )
 
+        The facet enumeration is kept, and updated incrementally when
+        probability mass functions are added (see
+        :class:`~murasyp.mathprog.DoubleDescription`).
+
+        """
+        if self._conversion is None:
+            self._conversion = murasyp.mathprog.DoubleDescription(self)
+        return murasyp.desirs.DesirSet([self._conversion.generators()])
+
+
+class StrongProduct(object):
+    """The strong product of credal sets, kept in factorized form
+
+      :arg `factors`: the marginal credal sets, in order
+      :type `factors`: a non-empty :class:`~collections.Iterable` of arguments
+        accepted by the :class:`~murasyp.credalsets.CredalSet` constructor
+
+    The joint credal set is the convex hull of the products of the marginal
+    probability mass functions, i.e., the variables are strongly independent.
+    Its possibility space is the cartesian product of the marginal ones, with
+    arguments nested pairs, as for the cylindrical extension of gambles (see
+    :class:`~murasyp.gambles.ProductGamble`). The joint credal set is never
+    materialized, unless explicitly asked for (see :meth:`get_credal`).
+
+    >>> K = CredalSet([{'a': 1, 'b': 1}, {'a': 1, 'b': 3}])
+    >>> L = CredalSet([{'c': 1}, {'c': 1, 'd': 1}])
+    >>> M = K.strong_product(L)
+    >>> f = Gamble({('a', 'c'): 1, ('a', 'd'): -1,
+    ...             ('b', 'c'): -1, ('b', 'd'): 1})
+    >>> M * f, M ** f
+    (Fraction(-1, 2), Fraction(0, 1))
+    >>> assert M * f == M.get_credal() * f
+
+    Lower and upper expectations of gambles on the whole product space, using
+    the ``*`` and ``**`` operators, are calculated by iterating over the
+    combinations of the vertices of all marginal credal sets but the largest
+    one, over which each resulting gamble is optimized (see
+    :meth:`~murasyp.credalsets.CredalSet.lower_previsions`). Those of
+    products and sums of marginal gambles only require marginal expectations
+    (see :meth:`product_previsions` and :meth:`sum_previsions`).
+
+    The expectations of product gambles (see
+    :class:`~murasyp.gambles.ProductGamble`) that extend a gamble on the
+    leading factors over the other ones are those of that gamble, which are
+    calculated without materializing the product gamble.
+
+    >>> g = Gamble({'a': 1, 'b': -1}) ^ {'c', 'd'}
+    >>> M * g, M ** g
+    (Fraction(-1, 2), Fraction(0, 1))
+    >>> assert M.product_previsions(g) == (M * g, M ** g)
+    >>> hasattr(g, '_materialized')
+    False
+
+    """
+    _chunksize = 256 # the number of vertex combinations handled at once
+
+    def __init__(self, factors):
+        """Create a strong product"""
+        self._factors = tuple(CredalSet(K) for K in factors)
+        if not self._factors or not all(self._factors):
+            raise ValueError("strong products need non-empty credal sets")
+
+    def factors(self):
+        """The marginal credal sets
+
+          :rtype: :class:`tuple` of :class:`~murasyp.credalsets.CredalSet`
+
+        """
+        return self._factors
+
+    def _split(self, arg):
+        """The marginal components of a product space argument"""
+        components = []
+        for _ in range(1, len(self._factors)):
+            arg, x = arg
+            components.append(x)
+        components.append(arg)
+        return components[::-1]
+
+    def _join(self, components):
+        """The product space argument of marginal components"""
+        arg = components[0]
+        for x in components[1:]:
+            arg = (arg, x)
+        return arg
+
+    def __mul__(self, other):
+        """Lower expectation of a gamble"""
+        if isinstance(other, Gamble):
+            return self.lower_previsions([other])[0]
+        else:
+            raise TypeError(str(other) + " is not a gamble")
+
+    def __pow__(self, other):
+        """Upper expectation of a gamble"""
+        if isinstance(other, Gamble):
+            return self.upper_previsions([other])[0]
+        else:
+            raise TypeError(str(other) + " is not a gamble")
+
+    def _previsions(self, gambles, upper):
+        """Lower or upper previsions of several gambles"""
+        previsions = []
+        for gamble in gambles:
+            if not isinstance(gamble, Gamble):
+                gamble = Gamble(gamble)
+            extension = self._extension(gamble)
+            if extension is None:
+                previsions.append(self._prevision(gamble, upper))
+            else:
+                model, base = extension
+                previsions.append(model ** base if upper else model * base)
+        return previsions
+
+    def _extension(self, gamble):
+        """The model of the leading factors and the base gamble of a product
+        gamble that extends over all other factors, or None"""
+        if not isinstance(gamble, ProductGamble) or not gamble._factors:
+            return None
+        k = len(self._factors) - len(gamble._factors)
+        if k < 1 or not all(K.pspace() <= factor for K, factor
+                            in zip(self._factors[k:], gamble._factors)):
+            return None
+        if k == 1:
+            return self._factors[0], gamble._base
+        return StrongProduct(self._factors[:k]), gamble._base
+
+    def _prevision(self, gamble, upper):
+        """Lower or upper prevision of a gamble on the product space"""
+        n = len(self._factors)
+        items = [(self._split(arg), value) for arg, value in gamble.items()]
+        domains = [{components[i] for components, value in items}
+                   for i in range(0, n)]
+        size = 1
+        for K, domain in zip(self._factors, domains):
+            if not K.pspace() <= domain:
+                raise ValueError("the gamble must be defined on the whole "
+                                 "product space")
+            size *= len(domain)
+        if size != len(items):
+            raise ValueError("the gamble must be defined on the whole "
+                             "product space")
+        items = [(components, value)
+                 for components, value in items if value != 0]
+        inner = max(range(0, n), key=lambda i: len(self._factors[i]))
+        outer = [i for i in range(0, n) if i != inner]
+        combinations = product(*(self._factors[i] for i in outer))
+        best = None
+        while True:
+            chunk = list(islice(combinations, self._chunksize))
+            if not chunk:
+                return best
+            marginals = []
+            for combination in chunk:
+                marginal = dict.fromkeys(domains[inner], 0)
+                for components, value in items:
+                    for i, p in zip(outer, combination):
+                        value *= p.get(components[i], 0)
+                        if value == 0:
+                            break
+                    else:
+                        marginal[components[inner]] += value
+                marginals.append(marginal)
+            values = self._factors[inner]._previsions(marginals, upper)
+            value = max(values) if upper else min(values)
+            if (best is None or
+                (value > best if upper else value < best)):
+                best = value
+
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor,
+            defined on the whole product space
+          :returns: the lower previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        """
+        return self._previsions(gambles, False)
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor,
+            defined on the whole product space
+          :returns: the upper previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        """
+        return self._previsions(gambles, True)
+
+    def _marginal_previsions(self, gambles):
+        """Lower and upper previsions of one marginal gamble per factor, or
+        of the base gamble of a product gamble"""
+        if isinstance(gambles, ProductGamble):
+            extension = self._extension(gambles)
+            if extension is None:
+                raise ValueError("the product gamble must extend a gamble on "
+                                 "the leading factors over the other ones")
+            model, base = extension
+            return [(model * base, model ** base)]
+        gambles = list(gambles)
+        if len(gambles) != len(self._factors):
+            raise ValueError("specify one gamble for each factor")
+        return [(K * Gamble(gamble), K ** Gamble(gamble))
+                for K, gamble in zip(self._factors, gambles)]
+
+    def product_previsions(self, gambles):
+        """Lower and upper previsions of a product of marginal gambles
+
+          :arg `gambles`: one gamble on each marginal possibility space, in the
+            order of the factors, or a product gamble (see
+            :class:`~murasyp.gambles.ProductGamble`) that extends a gamble on
+            the leading factors over the other ones, i.e., a product with
+            constant marginal gambles equal to one
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor, or a
+            :class:`~murasyp.gambles.ProductGamble`
+          :returns: the lower and upper prevision of the gamble whose value in
+            each argument is the product of the marginal gambles' values in its
+            components
+          :rtype: a pair (:class:`tuple`) of :class:`~fractions.Fraction`
+
+        Under strong independence, the expectations of the product range over
+        the products of the marginal expectations, which each range over an
+        interval, so the result follows by interval multiplication.
+
+        >>> K = CredalSet([{'a': 1, 'b': 1}, {'a': 1, 'b': 3}])
+        >>> L = CredalSet([{'c': 1}, {'c': 1, 'd': 1}])
+        >>> K.strong_product(L).product_previsions([{'a': 1, 'b': -1},
+        ...                                          {'c': 1, 'd': -1}])
+        (Fraction(-1, 2), Fraction(0, 1))
+
+        """
+        lower = upper = Fraction(1)
+        for bounds in self._marginal_previsions(gambles):
+            ends = [lower * bounds[0], lower * bounds[1],
+                    upper * bounds[0], upper * bounds[1]]
+            lower, upper = min(ends), max(ends)
+        return lower, upper
+
+    def sum_previsions(self, gambles):
+        """Lower and upper previsions of a sum of marginal gambles
+
+          :arg `gambles`: one gamble on each marginal possibility space, in the
+            order of the factors, or a product gamble, as for
+            :meth:`product_previsions` (a sum with zero marginal gambles)
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor, or a
+            :class:`~murasyp.gambles.ProductGamble`
+          :returns: the lower and upper prevision of the gamble whose value in
+            each argument is the sum of the marginal gambles' values in its
+            components, i.e., the sums of the marginal lower and upper
+            previsions
+          :rtype: a pair (:class:`tuple`) of :class:`~fractions.Fraction`
+
+        >>> K = CredalSet([{'a': 1, 'b': 1}, {'a': 1, 'b': 3}])
+        >>> L = CredalSet([{'c': 1}, {'c': 1, 'd': 1}])
+        >>> K.strong_product(L).sum_previsions([{'a': 1, 'b': -1},
+        ...                                      {'c': 1, 'd': -1}])
+        (Fraction(-1, 2), Fraction(1, 1))
+
+        """
+        bounds = self._marginal_previsions(gambles)
+        return (sum(lower for lower, upper in bounds),
+                sum(upper for lower, upper in bounds))
+
+    def get_credal(self):
+        """Materialize the joint credal set
+
+          :returns: the credal set of the products of the vertices of the
+            marginal credal sets
+          :rtype: :class:`~murasyp.credalsets.CredalSet`
+
+        .. note::
+
+          The number of probability mass functions and of their arguments both
+          grow exponentially with the number of factors.
+
+        """
+        joint = CredalSet()
+        for combination in product(*self._factors):
+            p = {}
+            for masses in product(*(p.items() for p in combination)):
+                mass = Fraction(1)
+                for x, value in masses:
+                    mass *= value
+                p[self._join([x for x, value in masses])] = mass
+            joint.add(p)
+        return joint
+
+    def get_desir(self):
+        """Generate the corresponding set of desirable gambles (see
+        :meth:`get_credal`)
+
+          :rtype: :class:`~murasyp.desirs.DesirSet`
+
         """
-        return murasyp.desirs.DesirSet([murasyp.mathprog.vf_enumeration(self)])
+        return self.get_credal().get_desir()
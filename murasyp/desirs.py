@@ -3,6 +3,30 @@ from murasyp.gambles import Gamble, Ray, Cone
 import murasyp.credalsets
 import murasyp.mathprog
 
+auto_simplify = False # whether models are simplified before solving
+
+def _components(cones):
+    """Group cones into the connected components of the graph that links
+    cones whose domains overlap"""
+    parent = {} # union-find forest on the states
+    def root(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for cone in cones:
+        states = list(cone.domain())
+        for x in states:
+            parent.setdefault(x, x)
+        for x in states[1:]:
+            parent[root(x)] = root(states[0])
+    groups = {}
+    for cone in cones:
+        states = cone.domain()
+        key = root(next(iter(states))) if states else cone
+        groups.setdefault(key, []).append(cone)
+    return list(groups.values())
+
 class DesirSet(set):
     """A set of cones
 
@@ -76,6 +100,52 @@ class DesirSet(set):
                             + " but you passed it " + str(data))
         else:
             set.__init__(self, (Cone(element) for element in data))
+        self._forget()
+
+    def __reduce__(self): # what is known about the cones is not pickled
+        return (type(self), (list(self),))
+
+    def _forget(self):
+        """Forget what is known about the cones"""
+        self._witness = None # a mass function certifying avoiding partial loss
+        self._unwitnessed = False # whether partial loss is known to be avoided
+                                  # although there is no witness
+        self._sure_loss = None # the possibility space on which sure loss is
+                               # known to be incurred
+        self._partial_loss = False # whether partial loss is known
+        self._conversion = None # the double description of the credal set
+        self._compiled = {} # the compiled copies, by whether simplified
+
+    def _removed(self):
+        """Update what is known about the cones after removing some (avoiding
+        partial loss, whether witnessed or not, is kept)"""
+        self._sure_loss = None
+        self._partial_loss = False
+        self._conversion = None
+        self._compiled = {}
+
+    def _added(self, cones):
+        """Update what is known about the cones after adding some"""
+        if self._conversion is not None:
+            for cone in cones:
+                for ray in cone:
+                    self._conversion.add_inequality(ray)
+        self._unwitnessed = False
+        self._compiled = {}
+        if self._sure_loss is not None and not all(
+                    cone.domain() <= self._sure_loss for cone in cones):
+            self._sure_loss = None # the loss may be avoided on new states
+        witness = self._witness
+        if witness is not None and not all(
+                    all(x in witness for x in cone.domain()) and
+                    all(sum(witness[x] * value
+                            for x, value in ray.items()) >= 0
+                        for ray in cone) and
+                    any(sum(witness[x] * value
+                            for x, value in ray.items()) > 0
+                        for ray in cone)
+                    for cone in cones):
+            self._witness = None
 
     def add(self, data):
         """Add a cone to the set of desirable gambles
@@ -96,7 +166,19 @@ class DesirSet(set):
             see whether all set functionality is carried over
 
         """
-        set.add(self, Cone(data))
+        cone = Cone(data)
+        set.add(self, cone)
+        self._added([cone])
+
+    def update(self, *others):
+        """Add the cones of other sets of cones"""
+        cones = [Cone(element) for other in others for element in other]
+        set.update(self, cones)
+        self._added(cones)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
     def discard(self, data):
         """Remove a cone from the set of desirable gambles
@@ -117,6 +199,46 @@ class DesirSet(set):
 
         """
         set.discard(self, frozenset(Ray(element) for element in data))
+        self._removed()
+
+    def remove(self, data):
+        """Remove a cone, which must be present, from the set of desirable
+        gambles (see :meth:`discard`)"""
+        set.remove(self, frozenset(Ray(element) for element in data))
+        self._removed()
+
+    def pop(self):
+        cone = set.pop(self)
+        self._removed()
+        return cone
+
+    def clear(self):
+        set.clear(self)
+        self._forget()
+
+    def difference_update(self, *others):
+        set.difference_update(self, *others)
+        self._removed()
+
+    def intersection_update(self, *others):
+        set.intersection_update(self, *others)
+        self._removed()
+
+    def symmetric_difference_update(self, other):
+        set.symmetric_difference_update(self, other)
+        self._forget()
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
 
     def pspace(self):
         """The possibility space of the set of desirable gambles
@@ -242,9 +364,26 @@ class DesirSet(set):
         >>> D.asl()
         True
 
+        The answer is tracked as described for :meth:`apl`, except that sure
+        loss, unlike partial loss, is only kept while the cones added do not
+        involve new states, on which the loss may be avoided:
+
+        >>> D = DesirSet([[{'a': -1}]])
+        >>> D.asl()
+        False
+        >>> D.add([{'b': 1}])
+        >>> D.asl()
+        True
+
         """
-        D = DesirSet([Cone.union(*(self | DesirSet([self.pspace()])))])
-        return murasyp.mathprog.feasible(D) == set()
+        if self._sure_loss is not None:
+            return False
+        if self._witness is not None or self._unwitnessed:
+            return True
+        avoids = self.compile().asl()
+        if not avoids:
+            self._sure_loss = self.pspace()
+        return avoids
 
     def apl(self):
         """Check whether the set of desirable gambles avoids partial loss
@@ -276,24 +415,102 @@ class DesirSet(set):
         >>> D.apl()
         True
 
+        What is learned when checking is kept, so that checking after each
+        new assessment does not take time proportional to the whole model:
+
+        * Once partial loss is incurred, adding cones does not change that.
+        * Otherwise, a strictly positive mass function is looked for that is
+          positive on all cones (see
+          :func:`~murasyp.mathprog.positive_witness`); it remains a
+          certificate of avoiding partial loss while the cones added are
+          positive on it, which is checked when they are added. Only when
+          it fails, the full problem is solved again. When none exists
+          (because of events with probability zero), it is remembered that
+          partial loss is avoided until cones are added.
+
+        >>> D = DesirSet()
+        >>> D.set_lower_pr(Gamble('a') | {'a', 'b'}, '1/4')
+        >>> D.apl()
+        True
+        >>> murasyp.mathprog.cache.clear()
+        >>> D.set_upper_pr(Gamble('a') | {'a', 'b'}, '1/2')
+        >>> D.apl()
+        True
+        >>> murasyp.mathprog.cache.info()[1] # no linear programs were solved
+        0
+        >>> D.set_upper_pr(Gamble('a') | {'a', 'b'}, '1/8')
+        >>> D.apl()
+        False
+
         """
-        D = self | DesirSet(self.pspace())
-        return murasyp.mathprog.feasible(D) == set()
+        if self._partial_loss:
+            return False
+        if self._witness is not None or self._unwitnessed:
+            return True
+        avoids = self.compile().apl()
+        if avoids:
+            self._witness = murasyp.mathprog.positive_witness(
+                                self | DesirSet(self.pspace()))
+            self._unwitnessed = self._witness is None
+        else:
+            self._partial_loss = True
+        return avoids
 
     def __mul__(self, other):
         """Lower expectation of a gamble"""
-        gamble = Gamble(other)
-        indicator = Gamble(gamble.domain())
-        return murasyp.mathprog.maximize(
-                  self | DesirSet(self.pspace() | gamble.domain()
-                                                | indicator.domain())
-                       | DesirSet([{indicator}, {-indicator}, {()}]),
-                  gamble, (0, {indicator: 1, -indicator: -1}))
+        return self.lower_previsions([other])[0]
 
     def __pow__(self, other):
         """Upper expectation of a gamble"""
         return - self.__mul__(- other)
 
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the lower previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        The gambles are grouped by domain, i.e., by conditioning event, and each
+        group is handled by a single
+        :class:`~murasyp.mathprog.CompiledProgram`, so that the work that only
+        depends on the model and the conditioning event is done once.
+
+        >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+        ...                Gamble({'a': 1, 'c': '-1/30'}),
+        ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+        ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+        >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+        >>> D.lower_previsions([f, f | f.support(), -f])
+        [Fraction(-1, 25), Fraction(-2, 5), Fraction(-1, 25)]
+
+        """
+        return self.compile().lower_previsions(gambles)
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the upper previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        See :meth:`lower_previsions`, in terms of which this is calculated.
+
+        >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+        ...                Gamble({'a': 1, 'c': '-1/30'}),
+        ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+        ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+        >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+        >>> D.upper_previsions([f, f | f.support()])
+        [Fraction(1, 25), Fraction(2, 5)]
+
+        """
+        return [- value for value
+                in self.lower_previsions(- Gamble(gamble)
+                                         for gamble in gambles)]
+
     def get_credal(self):
         """Generate the corresponding (closed) credal set
 
@@ -310,7 +527,262 @@ class DesirSet(set):
         ...                PMFunc({'a': 1}), PMFunc({'c': 1})})
         ... )
 
+        The vertex enumeration is kept, and updated incrementally when cones are
+        added (see :class:`~murasyp.mathprog.DoubleDescription`).
+
+        """
+        if self._conversion is None:
+            self._conversion = murasyp.mathprog.DoubleDescription(
+                                    Cone.union(*self))
+        return murasyp.credalsets.CredalSet(self._conversion.generators())
+
+    def simplify(self):
+        """Remove redundant rays and subsumed cones
+
+        Each cone is replaced by its :meth:`~murasyp.gambles.Cone.minimal`
+        version, and cones of which all rays lie in the relative interior of
+        another cone (see :func:`~murasyp.mathprog.in_relative_interior`) are
+        removed; for models that avoid sure loss, neither changes the
+        inferences that can be made.
+
+        >>> D = DesirSet([[{'a': 1}, {'b': 1}, {'a': 1, 'b': 1}],
+        ...               [{'a': 1, 'b': 2}], [{'a': -1, 'b': 1}]])
+        >>> D.simplify()
+        >>> assert D == DesirSet([Cone('ab'), [{'a': -1, 'b': 1}]])
+
+        Simplification can also be done automatically, each time before
+        calculations are done, by setting `murasyp.desirs.auto_simplify` to
+        ``True``.
+
         """
-        C = Cone.union(*self)
-        return murasyp.credalsets.CredalSet(murasyp.mathprog.vf_enumeration(C))
+        cones = {cone.minimal() for cone in self}
+        kept = set(cones)
+        for cone in sorted(cones, key=len):
+            support = frozenset().union(*(ray.domain() for ray in cone))
+            for other in kept:
+                if (other != cone and support <= other.domain() and
+                    all(murasyp.mathprog.in_relative_interior(ray, other)
+                        for ray in cone)):
+                    kept.discard(cone)
+                    break
+        set.clear(self)
+        set.update(self, kept) # what is known about consistency remains valid
+        self._compiled = {}
+
+    def components(self):
+        """Split the set of desirable gambles into independent parts
+
+          :returns: the parts, i.e., the connected components of the graph in
+            which cones are linked if their domains overlap
+          :rtype: :class:`list` of :class:`DesirSet`
+
+        Cones in different parts do not interact: the set of desirable gambles
+        avoids partial loss if and only if all parts do, it avoids sure loss if
+        and only if some part does, and a lower or upper prevision only depends
+        on the parts whose possibility space meets the gamble's domain.
+        Compiled sets of desirable gambles (see :meth:`compile`) use this to
+        solve smaller linear programs.
+
+        >>> D = DesirSet()
+        >>> D.set_lower_pr(Gamble('a') | {'a', 'b'}, '1/4')
+        >>> D.set_upper_pr(Gamble('b') | {'b', 'c'}, '1/2')
+        >>> D.set_lower_pr(Gamble('d') | {'d', 'e'}, '1/3')
+        >>> sorted(len(E.pspace()) for E in D.components())
+        [2, 3]
+
+        The parts can be checked in parallel, e.g., using
+        :func:`~murasyp.parallel.map_models`.
+
+        """
+        return [DesirSet(cones) for cones in _components(self)]
+
+    def compile(self, simplify=None):
+        """Compile the set of desirable gambles for repeated inference
+
+          :arg `simplify`: whether to simplify the compiled copy (see
+            :meth:`simplify`; by default, `murasyp.desirs.auto_simplify`)
+          :type `simplify`: :class:`bool`
+          :returns: an immutable copy of the set of desirable gambles
+          :rtype: :class:`CompiledDesirSet`
+
+        >>> D = DesirSet(['abc'])
+        >>> D.set_lower_pr({'a': 1, 'b': 0, 'c': 1}, .5)
+        >>> C = D.compile()
+        >>> C * Gamble({'a': 1, 'b': -1, 'c': 0})
+        Fraction(-1, 2)
+        >>> assert C == D
+
+        The compiled copy is kept until the set of desirable gambles is
+        changed, so that what it has calculated is reused by later queries.
+
+        >>> assert D.compile() is D.compile()
+
+        """
+        simplify = bool(auto_simplify if simplify is None else simplify)
+        if simplify not in self._compiled:
+            if simplify:
+                D = DesirSet(self)
+                D.simplify()
+                self._compiled[simplify] = CompiledDesirSet(D)
+            else:
+                self._compiled[simplify] = CompiledDesirSet(self)
+        return self._compiled[simplify]
+
+
+class CompiledDesirSet(frozenset):
+    """An immutable set of cones, compiled for repeated inference
+
+      :type `data`: as for :class:`DesirSet`
+
+    Queries about a :class:`DesirSet` start from scratch each time, as it may
+    have changed in between. Because a compiled set of desirable gambles cannot
+    change, everything that depends only on the model is calculated once, when
+    it is first needed, and kept: the possibility space, the answers to
+    :meth:`asl` and :meth:`apl`, the credal set, and, for each conditioning
+    event, a :class:`~murasyp.mathprog.CompiledProgram` holding the stripped
+    feasible cones, the coordinates, the ray numbering, and the constraint
+    matrix. Lower and upper previsions then only require filling in the gamble
+    and solving. Each of these only involves the independent parts of the
+    model that matter (see :meth:`DesirSet.components`).
+
+    >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+    ...                Gamble({'a': 1, 'c': '-1/30'}),
+    ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+    ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+    >>> C = D.compile()
+    >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+    >>> C * f, C ** f, C * (f | f.support())
+    (Fraction(-1, 25), Fraction(1, 25), Fraction(-2, 5))
+    >>> C.apl()
+    True
+
+    The methods of :class:`DesirSet` that do not change it are available as
+    well; those that would change it are not.
+
+    """
+    def __new__(cls, data=[]):
+        """Create a frozenset of cones"""
+        if isinstance(data, Mapping):
+            raise TypeError(str(cls) + " does not accept a mapping,"
+                            + " but you passed it " + str(data))
+        else:
+            return frozenset.__new__(cls, (Cone(element) for element in data))
+
+    def __init__(self, data=[]):
+        """Initialize the compiled set of desirable gambles"""
+        self._pspace = frozenset().union(*(cone.domain() for cone in self))
+        self._consistency = {}
+        self._credal = None
+        self._components = None
+        self._programs = {} # the compiled program of each conditioning event
+
+    def __reduce__(self): # what was calculated is not pickled
+        return (type(self), (list(self),))
+
+    def pspace(self):
+        """The possibility space of the set of desirable gambles
+
+          :rtype: :class:`frozenset`
+
+        """
+        return self._pspace
+
+    def components(self):
+        """Split the set of desirable gambles into independent parts (see
+        :meth:`DesirSet.components`)
+
+          :rtype: :class:`list` of :class:`CompiledDesirSet`
+
+        """
+        if self._components is None:
+            cones = _components(self)
+            if len(cones) == 1:
+                self._components = [self]
+            else:
+                self._components = [type(self)(part) for part in cones]
+        return self._components
+
+    def asl(self):
+        """Check whether the set of desirable gambles avoids sure loss (see
+        :meth:`DesirSet.asl`)"""
+        if 'asl' not in self._consistency:
+            if len(self.components()) > 1:
+                # sure loss requires a combination negative on all parts
+                avoids = any(part.asl() for part in self.components())
+            else:
+                D = DesirSet([Cone.union(*(self | DesirSet([self.pspace()])))])
+                avoids = murasyp.mathprog.feasible(D) == set()
+            self._consistency['asl'] = avoids
+        return self._consistency['asl']
+
+    def apl(self):
+        """Check whether the set of desirable gambles avoids partial loss (see
+        :meth:`DesirSet.apl`)"""
+        if 'apl' not in self._consistency:
+            if len(self.components()) > 1:
+                avoids = all(part.apl() for part in self.components())
+            else:
+                D = self | DesirSet(self.pspace())
+                avoids = murasyp.mathprog.feasible(D) == set()
+            self._consistency['apl'] = avoids
+        return self._consistency['apl']
+
+    def program(self, domain):
+        """The compiled linear program for a conditioning event
+
+          :arg `domain`: the conditioning event
+          :type `domain`: :class:`frozenset`
+          :rtype: :class:`~murasyp.mathprog.CompiledProgram`
+
+        """
+        domain = frozenset(domain)
+        if domain not in self._programs:
+            parts = [part for part in self.components()
+                          if part.pspace() & domain]
+            cones = frozenset().union(*parts)
+            pspace = frozenset().union(*(part.pspace() for part in parts))
+            indicator = Gamble(domain)
+            self._programs[domain] = murasyp.mathprog.CompiledProgram(
+                DesirSet(cones) | DesirSet(pspace | domain)
+                                | DesirSet([{indicator}, {-indicator}, {()}]),
+                (0, {indicator: 1, -indicator: -1}))
+        return self._programs[domain]
+
+    def __mul__(self, other):
+        """Lower expectation of a gamble"""
+        return self.lower_previsions([other])[0]
+
+    def __pow__(self, other):
+        """Upper expectation of a gamble"""
+        return - self.__mul__(- other)
+
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles (see
+        :meth:`DesirSet.lower_previsions`)"""
+        gambles = [Gamble(gamble) for gamble in gambles]
+        groups = {}
+        for n, gamble in enumerate(gambles):
+            groups.setdefault(gamble.domain(), []).append(n)
+        previsions = len(gambles) * [None]
+        for domain, group in groups.items():
+            values = self.program(domain).maximize_batch(gambles[n]
+                                                         for n in group)
+            for n, value in zip(group, values):
+                previsions[n] = value
+        return previsions
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles (see
+        :meth:`DesirSet.upper_previsions`)"""
+        return [- value for value
+                in self.lower_previsions(- Gamble(gamble)
+                                         for gamble in gambles)]
+
+    def get_credal(self):
+        """Generate the corresponding (closed) credal set (see
+        :meth:`DesirSet.get_credal`)"""
+        if self._credal is None:
+            self._credal = murasyp.credalsets.CredalSet(
+                                murasyp.mathprog.vf_stream(Cone.union(*self)))
+        return murasyp.credalsets.CredalSet(self._credal)
 
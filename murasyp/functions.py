@@ -1,6 +1,77 @@
 from __future__ import division
 from collections import Mapping
 from fractions import Fraction
+from math import gcd
+
+def _lcm(a, b):
+    """Least common multiple of two positive integers"""
+    return a * (b // gcd(a, b))
+
+def _common_denominator(values):
+    """Integer numerators of rational values over a common denominator
+
+      :type `values`: an :class:`~collections.Iterable` of
+        :class:`~fractions.Fraction`
+      :returns: the numerators of the values, in iteration order, and their
+        (least) common denominator
+      :rtype: a pair (:class:`tuple`) of a :class:`list` of :class:`int` and an
+        :class:`int`
+
+    >>> _common_denominator([Fraction(1, 2), Fraction(-1, 3), Fraction(0)])
+    ([3, -2, 0], 6)
+
+    """
+    values = list(values)
+    denominator = 1
+    for value in values:
+        if denominator % value.denominator != 0:
+            denominator = _lcm(denominator, value.denominator)
+    return ([value.numerator * (denominator // value.denominator)
+             for value in values],
+            denominator)
+
+def _scalar_add(numerators, denominator, other):
+    """Add a scalar to integer numerators over a common denominator"""
+    multiple = _lcm(denominator, other.denominator)
+    scale = multiple // denominator
+    shift = other.numerator * (multiple // other.denominator)
+    return [numerator * scale + shift for numerator in numerators], multiple
+
+def _scalar_mul(numerators, denominator, other):
+    """Multiply integer numerators over a common denominator by a scalar"""
+    return ([numerator * other.numerator for numerator in numerators],
+            denominator * other.denominator)
+
+def _scalar_truediv(numerators, denominator, other):
+    """Divide integer numerators over a common denominator by a scalar"""
+    return ([numerator * other.denominator for numerator in numerators],
+            denominator * other.numerator)
+
+_integer_scalar_operators = {Fraction.__add__: _scalar_add,
+                             Fraction.__mul__: _scalar_mul,
+                             Fraction.__truediv__: _scalar_truediv}
+
+def _pointwise_add(numerators, denominator,
+                   other_numerators, other_denominator):
+    """Pointwise sum of integer arrays over their common denominators"""
+    multiple = _lcm(denominator, other_denominator)
+    scale = multiple // denominator
+    other_scale = multiple // other_denominator
+    return ([numerator * scale + other_numerator * other_scale
+             for numerator, other_numerator
+             in zip(numerators, other_numerators)],
+            multiple)
+
+def _pointwise_mul(numerators, denominator,
+                   other_numerators, other_denominator):
+    """Pointwise product of integer arrays over their common denominators"""
+    return ([numerator * other_numerator
+             for numerator, other_numerator
+             in zip(numerators, other_numerators)],
+            denominator * other_denominator)
+
+_integer_pointwise_operators = {Fraction.__add__: _pointwise_add,
+                                Fraction.__mul__: _pointwise_mul}
 
 class Function(Mapping):
     """Rational-valued functions
@@ -38,18 +109,63 @@ class Function(Mapping):
         The domain of results of sums and differences is the intersection of
         the respective domains.
 
+      .. note::
+
+        Sums, products and scalings are computed on the integer numerators of
+        the values over a common denominator, so that only a single
+        normalization per value is needed for the result.
+
+    * Functions are immutable; their domain, range, and support are computed
+      only once.
+
+      >>> f = Function({'a': 1, 'b': -1, 'c': 0})
+      >>> f._mapping = {}
+      Traceback (most recent call last):
+        ...
+      AttributeError: 'Function' objects are immutable
+      >>> assert f.domain() is f.domain()
+
     """
 
+    __slots__ = ('_mapping', '_domain', '_range', '_support')
+
     def __init__(self, mapping={}):
         """Create a rational-valued function"""
-        if isinstance(mapping, Mapping):
-            self._mapping = {arg: self._make_rational(value)
-                             for arg, value in mapping.items()}
+        if isinstance(mapping, Function): # values are already Fractions
+            self._set_mapping(mapping._mapping)
+        elif isinstance(mapping, Mapping):
+            self._set_mapping({arg: self._make_rational(value)
+                               for arg, value in mapping.items()})
         else:
             raise TypeError("specify a mapping")
 
+    def _set_mapping(self, mapping):
+        """Set the values of a function under construction (as is)"""
+        object.__setattr__(self, '_mapping', mapping)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'" + type(self).__name__ + "' objects are "
+                             "immutable")
+
+    __delattr__ = lambda self, name: self.__setattr__(name, None)
+
+    def __reduce__(self):
+        """Pickle support (also needed because of the slots)"""
+        return (type(self), (dict(self._mapping),))
+
+    def _cached(self, attribute, compute):
+        """Value of a lazily computed and memoized attribute"""
+        try:
+            return getattr(self, attribute)
+        except AttributeError:
+            value = compute()
+            object.__setattr__(self, attribute, value)
+            return value
+
     def _make_rational(self, value):
         """Make a Fraction of acceptable input"""
+        if type(value) == Fraction:
+            return value
         if type(value) == float:
             value = str(value) # treat floats as decimal numbers
         try:
@@ -57,11 +173,28 @@ class Function(Mapping):
         except ValueError:
             print(repr(value) + " is not a Rational number")
 
+    def _parse_items(self, mapping):
+        """Arguments and rational values of a mapping, in a single pass"""
+        args = []
+        values = []
+        for arg, value in mapping.items():
+            args.append(arg)
+            values.append(self._make_rational(value))
+        return args, values
+
     __len__ = lambda self: len(self._mapping)
     __iter__ = lambda self: iter(self._mapping)
     __contains__ = lambda self, element: element in self._mapping
     __getitem__ = lambda self, element: self._mapping[element]
 
+    def __eq__(self, other):
+        if isinstance(other, Function):
+            return self._mapping == other._mapping
+        else:
+            return Mapping.__eq__(self, other)
+
+    __ne__ = lambda self, other: not self == other
+
     def __repr__(self):
         """Return a readable unambiguous string representation"""
         return type(self).__name__ + '(' + str(self) + ')'
@@ -87,7 +220,7 @@ class Function(Mapping):
         ... )
 
         """
-        return frozenset(self.keys())
+        return self._cached('_domain', lambda: frozenset(self._mapping))
 
     def range(self):
         """Range of the function
@@ -102,7 +235,8 @@ class Function(Mapping):
         ... )
 
         """
-        return frozenset(self.values())
+        return self._cached('_range',
+                            lambda: frozenset(self._mapping.values()))
 
     def support(self):
         """Support of the function
@@ -117,12 +251,51 @@ class Function(Mapping):
         ... )
 
         """
-        return frozenset(arg for arg, value in self.items() if value != 0)
+        return self._cached('_support',
+                            lambda: frozenset(arg for arg, value
+                                                  in self._mapping.items()
+                                                  if value != 0))
+
+    def _from_integer_form(self, args, numerators, denominator):
+        """Function of the same type with values over a common denominator
+
+        The numerators and the denominator are first reduced by their greatest
+        common divisor, once for the whole function. The values must still be
+        fractions in lowest terms, so each distinct numerator is normalized
+        once, unless the reduced denominator is one.
+
+        """
+        numerators = list(numerators)
+        divisor = denominator
+        for numerator in numerators:
+            if divisor == 1:
+                break
+            divisor = gcd(divisor, numerator)
+        if divisor != 1:
+            numerators = [numerator // divisor for numerator in numerators]
+            denominator //= divisor
+        values = {} # the value for each distinct numerator
+        mapping = {}
+        for arg, numerator in zip(args, numerators):
+            value = values.get(numerator)
+            if value is None:
+                value = values[numerator] = (
+                            Fraction(numerator) if denominator == 1
+                            else Fraction(numerator, denominator))
+            mapping[arg] = value
+        return type(self)(mapping)
 
     def _with_scalar(self, other, operator):
         """Application of a binary operator to a function/scalar-pair"""
         try:
             other = self._make_rational(other)
+            if operator in _integer_scalar_operators:
+                numerators, denominator = _common_denominator(
+                                                      self._mapping.values())
+                numerators, denominator = _integer_scalar_operators[operator](
+                                              numerators, denominator, other)
+                return self._from_integer_form(self._mapping.keys(),
+                                               numerators, denominator)
             return type(self)({arg: operator(value, other)
                               for arg, value in self.items()})
         except:
@@ -131,8 +304,19 @@ class Function(Mapping):
     def _with_function(self, other, operator):
         """pointwise application of a binary operator to a pair of functions"""
         if isinstance(other, type(self)):
+            args = list(self._domain_joiner(other))
+            if operator in _integer_pointwise_operators:
+                numerators, denominator = _common_denominator(
+                                                    self[arg] for arg in args)
+                other_numerators, other_denominator = _common_denominator(
+                                                   other[arg] for arg in args)
+                numerators, denominator = _integer_pointwise_operators[
+                                             operator](numerators, denominator,
+                                                       other_numerators,
+                                                       other_denominator)
+                return self._from_integer_form(args, numerators, denominator)
             return type(self)({arg: operator(self[arg], other[arg])
-                              for arg in self._domain_joiner(other)})
+                              for arg in args})
         else:
             raise TypeError("cannot apply '" + operator.__name__ + "'"
                             " to objects of types: '" +
@@ -1,5 +1,10 @@
 from __future__ import division
 from collections import Set, Mapping
+from functools import reduce
+from operator import mul
+from fractions import Fraction
+from cdd import Matrix, RepType
+from murasyp.functions import _common_denominator
 from murasyp.vectors import Vector, Polytope
 
 class Gamble(Vector):
@@ -27,8 +32,13 @@ class Gamble(Vector):
       ...             ('a', 'c'): 0, ('b', 'd'): -1})
       ... )
 
+      The result is a :class:`~murasyp.gambles.ProductGamble`, so the
+      cartesian product is not materialized.
+
     """
 
+    __slots__ = ()
+
     def __init__(self, data={}):
         """Create a gamble"""
         if isinstance(data, Mapping):  # Hashable Mapping to Rational
@@ -39,7 +49,7 @@ class Gamble(Vector):
     def __xor__(self, other):
         """Cylindrical extension"""
         if isinstance(other, Set):
-            return type(self)({(x, y): self[x] for x in self for y in other})
+            return ProductGamble(self, (other,))
         else:
             raise TypeError("the argument must be a Set")
 
@@ -55,9 +65,11 @@ class Gamble(Vector):
         (0, 0)
 
         """
-        values = self.range()
-        if values != frozenset():
-            return (min(values), max(values))
+        if len(self) > 0:
+            numerators, denominator = _common_denominator(
+                                                      self._mapping.values())
+            return (Fraction(min(numerators), denominator),
+                    Fraction(max(numerators), denominator))
         else:
             return (0, 0)
 
@@ -118,8 +130,175 @@ class Gamble(Vector):
           True
 
         """
-        norm = self.norm()
-        return None if norm == 0 else self / norm
+        numerators, denominator = _common_denominator(self._mapping.values())
+        norm = max([abs(numerator) for numerator in numerators] + [0])
+        return (None if norm == 0 else
+                self._from_integer_form(self._mapping.keys(), numerators, norm))
+
+
+class ProductGamble(Gamble):
+    """Cylindrical extensions of gambles to product spaces
+
+      :arg `data`: the base gamble
+      :type `data`: arguments accepted by the
+        :class:`~murasyp.gambles.Gamble` constructor
+      :arg `factors`: the factors by which the domain of the base gamble is
+        extended, in order
+      :type `factors`: a :class:`~collections.Sequence` of
+        :class:`~collections.Set`
+
+    This class derives from :class:`~murasyp.gambles.Gamble`, so its methods
+    apply here as well.
+
+    What has changed:
+
+    * Its domain is the cartesian product of the domain of the base gamble and
+      the factors (arguments are nested pairs), but it is not materialized;
+      values are looked up in the base gamble on demand.
+
+      >>> f = ProductGamble({'a': 0, 'b': -1}, [{'c', 'd'}, {'e'}])
+      >>> len(f)
+      4
+      >>> f[(('b', 'd'), 'e')]
+      Fraction(-1, 1)
+      >>> assert f == Gamble({(('a', 'c'), 'e'): 0, (('a', 'd'), 'e'): 0,
+      ...                     (('b', 'c'), 'e'): -1, (('b', 'd'), 'e'): -1})
+      >>> assert f == Gamble({'a': 0, 'b': -1}) ^ {'c', 'd'} ^ {'e'}
+
+    * Arithmetic with scalars, and with product gambles that extend over the
+      same factors, is performed on the base gambles, so the result stays
+      lazy; other arithmetic materializes the product gamble.
+
+      >>> g = 2 * f + 1
+      >>> type(g).__name__
+      'ProductGamble'
+      >>> assert g == Gamble({'a': 1, 'b': -1}) ^ {'c', 'd'} ^ {'e'}
+      >>> h = Gamble({'a': 0, 'b': -1}) ^ {'c', 'd'}
+      >>> k = 1 - 2 * h
+      >>> hasattr(h, '_materialized'), hasattr(k, '_materialized')
+      (False, False)
+      >>> assert f.bounds() == (-1, 0) and f.norm() == 1
+
+      The product gamble is materialized when its values are needed all at
+      once, such as when it is converted to a plain
+      :class:`~murasyp.gambles.Gamble`, hashed, or passed on to the
+      :mod:`~murasyp.mathprog` functions.
+
+    """
+
+    __slots__ = ('_base', '_factors', '_materialized')
+
+    def __init__(self, data={}, factors=()):
+        """Create a product gamble"""
+        object.__setattr__(self, '_base', Gamble(data))
+        object.__setattr__(self, '_factors',
+                           tuple(frozenset(factor) for factor in factors))
+
+    def __reduce__(self):
+        """Pickle support"""
+        return (type(self), (self._base, self._factors))
+
+    @property
+    def _mapping(self):
+        """The materialized values"""
+        return self._cached('_materialized',
+                            lambda: {arg: self[arg] for arg in self})
+
+    def _split(self, arg):
+        """Base gamble argument of a product space argument, or None"""
+        for factor in reversed(self._factors):
+            if not (isinstance(arg, tuple) and len(arg) == 2):
+                return None
+            arg, y = arg
+            if y not in factor:
+                return None
+        return arg if arg in self._base else None
+
+    __len__ = lambda self: reduce(mul, (len(factor)
+                                        for factor in self._factors),
+                                  len(self._base))
+
+    def __iter__(self):
+        args = iter(self._base)
+        for factor in self._factors:
+            args = _cartesian_product(args, factor)
+        return args
+
+    def __contains__(self, arg):
+        return self._split(arg) is not None
+
+    def __getitem__(self, arg):
+        base_arg = self._split(arg)
+        if base_arg is None:
+            return self._make_rational(0)
+        else:
+            return self._base[base_arg]
+
+    def __xor__(self, other):
+        """Cylindrical extension"""
+        if isinstance(other, Set):
+            return type(self)(self._base, self._factors + (other,))
+        else:
+            raise TypeError("the argument must be a Set")
+
+    def __or__(self, other):
+        """Restriction or extension with zero"""
+        if isinstance(other, Set):
+            return Gamble({x: self[x] for x in other})
+        else:
+            raise TypeError("the argument must be a Set")
+
+    def _from_integer_form(self, args, numerators, denominator):
+        """Gamble with values over a common denominator"""
+        return Gamble(self)._from_integer_form(args, numerators, denominator)
+
+    def _with_scalar(self, other, operator):
+        """Application of a binary operator to the base gamble and a scalar"""
+        base = self._base._with_scalar(other, operator)
+        if base is NotImplemented:
+            return NotImplemented
+        else:
+            return type(self)(base, self._factors)
+
+    def _with_function(self, other, operator):
+        """Pointwise application of a binary operator to a pair of gambles"""
+        if not isinstance(other, Gamble): # e.g., a scalar; stay lazy
+            raise TypeError("cannot apply '" + operator.__name__ + "'"
+                            " to objects of types: '" +
+                            type(self).__name__ + "' and '" +
+                            type(other).__name__ + "'")
+        if (isinstance(other, ProductGamble) and
+            other._factors == self._factors):
+            return type(self)(self._base._with_function(other._base, operator),
+                              self._factors)
+        else:
+            return Gamble(self)._with_function(other, operator)
+
+    def mass(self):
+        """Sum of the values, computed from the base gamble"""
+        return self._base.mass() * reduce(mul, (len(factor)
+                                                for factor in self._factors),
+                                          1)
+
+    def is_nonnegative(self):
+        """Nonnegativity, checked on the base gamble"""
+        return len(self) == 0 or self._base.is_nonnegative()
+
+    def bounds(self):
+        """The minimum and maximum values, taken from the base gamble"""
+        return self._base.bounds() if len(self) > 0 else (0, 0)
+
+    def normalized(self):
+        """Max-norm normalized version, computed on the base gamble"""
+        base = self._base.normalized() if len(self) > 0 else None
+        return None if base is None else type(self)(base, self._factors)
+
+
+def _cartesian_product(args, factor):
+    """Pairs of arguments with the elements of a factor"""
+    for x in args:
+        for y in factor:
+            yield (x, y)
 
 
 class Ray(Gamble):
@@ -142,13 +321,21 @@ class Ray(Gamble):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, data={}):
         """Create a ray"""
-        gamble = Gamble(data).normalized()
-        if gamble == None:
-            Gamble.__init__(self, {})
-        else:
-            Gamble.__init__(self, gamble | gamble.support())
+        if isinstance(data, Ray): # already normalized
+            self._set_mapping(data._mapping)
+            return
+        if not isinstance(data, Mapping): # indicator over Hashable Container
+            data = {component: 1 for component in data}
+        args, values = self._parse_items(data)
+        numerators, denominator = _common_denominator(values)
+        norm = max([abs(numerator) for numerator in numerators] + [0])
+        self._set_mapping({arg: Fraction(numerator, norm)
+                           for arg, numerator in zip(args, numerators)
+                           if numerator != 0})
 
     __add__ = lambda self, other: Gamble(self) + other
     __radd__ = __add__
@@ -198,3 +385,35 @@ class Cone(Polytope):
     def __init__(self, data=[]): # only here for Sphinx to pick up the argument
         """Initialize the cone"""
         pass
+
+    def minimal(self):
+        """The cone without its redundant rays
+
+          :returns: the cone consisting of those rays that are not positive
+            linear combinations of the others
+          :rtype: :class:`~murasyp.gambles.Cone`
+
+        The rays that remain generate the same cone, so that the positive
+        linear combinations of all of them are the same as before.
+
+        >>> assert (
+        ...     Cone([{'a': 1}, {'b': 1}, {'a': 1, 'b': 1}, {'a': 2, 'b': 3}])
+        ...     .minimal() == Cone('ab')
+        ... )
+        >>> assert (
+        ...     Cone([{'a': 1}, {'a': -1}, {'a': 1, 'b': 1}]).minimal() ==
+        ...     Cone([{'a': 1}, {'a': -1}, {'a': 1, 'b': 1}])
+        ... )
+
+        """
+        if len(self) < 2:
+            return self
+        coordinates = list(self.domain())
+        rays = list(self)
+        mat = Matrix([[0] + [ray[x] for x in coordinates] for ray in rays],
+                     number_type='fraction')
+        mat.rep_type = RepType.GENERATOR
+        lin, red = mat.canonicalize()
+        if not red:
+            return self
+        return type(self)(ray for i, ray in enumerate(rays) if i not in red)
@@ -0,0 +1,660 @@
+from collections import Mapping
+from fractions import Fraction
+from murasyp.functions import Function
+from murasyp.vectors import PossibilitySpace, Vector
+from murasyp.gambles import Gamble
+import murasyp.desirs
+import murasyp.credalsets
+
+def _proper(lower, upper):
+    """Whether some mass function lies between bounds on the states"""
+    return (all(l <= u for l, u in zip(lower, upper)) and
+            sum(lower) <= 1 <= sum(upper))
+
+def _greedy(lower, upper, values):
+    """Lowest expectation of values over the mass functions between proper
+    bounds, obtained by moving the free mass to the lowest values first"""
+    prevision = sum(l * value for l, value in zip(lower, values))
+    mass = 1 - sum(lower)
+    for i in sorted(range(0, len(values)), key=values.__getitem__):
+        if mass == 0:
+            break
+        step = min(upper[i] - lower[i], mass)
+        prevision += step * values[i]
+        mass -= step
+    return prevision
+
+
+class LowerProbability(Function):
+    """Lower probabilities map events to lower probability values
+
+      :type `data`: :class:`~collections.Mapping` of events, i.e., non-empty
+        :class:`~collections.Iterable` :class:`~collections.Container` of
+        states, to a representation of :class:`~numbers.Real`
+      :arg `pspace`: the possibility space (by default, the union of the
+        events)
+      :type `pspace`: :class:`~collections.Iterable` of states
+
+      >>> L = LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'})
+      >>> assert L.pspace() == frozenset({'a', 'b', 'c'})
+      >>> L[frozenset({'a', 'b'})]
+      Fraction(3, 10)
+
+    This class derives from :class:`~murasyp.functions.Function`, so its
+    methods apply here as well.
+
+    Additional and changed methods:
+
+    * Lower and upper expectations can be calculated, using the ``*`` and
+      ``**`` operators, respectively.
+
+      >>> f = Gamble({'a': 1, 'b': 2, 'c': 3})
+      >>> L * f
+      Fraction(3, 2)
+      >>> L ** f
+      Fraction(13, 5)
+
+      When only states and their complements are assessed, the lower
+      expectation of a gamble on the possibility space is calculated as for
+      :class:`ProbabilityIntervals`. Otherwise, when the lower probability
+      is found to have a 2-monotone natural extension (see
+      :meth:`is_2monotone`), the lower expectation is its Choquet integral.
+      This is the case, e.g., for belief functions assessed on all events
+      (see :meth:`from_mobius`), but not necessarily when only their focal
+      sets are assessed. In all other cases, including conditional
+      expectations (for gambles whose domain differs from the possibility
+      space), the corresponding set of desirable gambles (see
+      :meth:`get_desir`) is used.
+
+      >>> L.is_2monotone()
+      True
+      >>> L * f == L.get_desir() * f
+      True
+      >>> L * (f | {'a', 'b'})
+      Fraction(1, 1)
+
+    """
+
+    __slots__ = ('_pspace', '_table', '_monotone', '_desir', '_intervals')
+
+    def __init__(self, data={}, pspace=None):
+        """Create a lower probability"""
+        if isinstance(data, LowerProbability):
+            self._set_mapping(data._mapping)
+            if pspace is None:
+                pspace = data._pspace
+        elif isinstance(data, Mapping):
+            args, values = self._parse_items(data)
+            self._set_mapping({frozenset(arg): value
+                               for arg, value in zip(args, values)})
+        else:
+            raise TypeError("specify a mapping")
+        if pspace is None:
+            pspace = frozenset().union(*self._mapping)
+        if not isinstance(pspace, PossibilitySpace):
+            pspace = PossibilitySpace(pspace)
+        if not all(event <= pspace for event in self._mapping):
+            raise ValueError("the events must be subsets of the possibility "
+                             "space " + str(set(pspace)))
+        object.__setattr__(self, '_pspace', pspace)
+
+    def __reduce__(self):
+        return (type(self), (dict(self._mapping), self._pspace.states))
+
+    def pspace(self):
+        """The possibility space of the lower probability
+
+          :rtype: :class:`~murasyp.vectors.PossibilitySpace`
+
+        """
+        return self._pspace
+
+    @classmethod
+    def from_mobius(cls, masses, pspace=None):
+        """Create the belief function with the given Möbius inverse
+
+          :arg `masses`: the basic probability assignment, i.e., nonnegative
+            masses of non-empty events that sum to one
+          :type `masses`: :class:`~collections.Mapping` of events to a
+            representation of :class:`~numbers.Real`
+          :arg `pspace`: the possibility space (by default, the union of the
+            events)
+          :type `pspace`: :class:`~collections.Iterable` of states
+          :returns: the lower probability that assesses the belief of every
+            event with nonzero belief
+          :rtype: :class:`LowerProbability`
+
+        Belief functions are 2-monotone, so this is not checked again.
+
+        >>> L = LowerProbability.from_mobius({'a': .2, 'bc': .3, 'abc': .5})
+        >>> L[frozenset('ab')], L.is_2monotone()
+        (Fraction(1, 5), True)
+        >>> assert L.mobius() == Function({frozenset('a'): '1/5',
+        ...                                frozenset('bc'): '3/10',
+        ...                                frozenset('abc'): '1/2'})
+
+        .. note::
+
+          All events are tabulated, so possibility spaces with more than 20
+          states are not accepted.
+
+        """
+        masses = Vector({frozenset(event): value
+                         for event, value in masses.items()})
+        if (frozenset() in masses or not masses.is_nonnegative() or
+            masses.mass() != 1):
+            raise ValueError("the masses must be nonnegative, of non-empty "
+                             "events, and sum to one")
+        if pspace is None:
+            pspace = frozenset().union(*masses)
+        if not isinstance(pspace, PossibilitySpace):
+            pspace = PossibilitySpace(pspace)
+        n = len(pspace)
+        if n > 20:
+            raise ValueError("at most 20 states can be tabulated")
+        if not all(event <= pspace for event in masses):
+            raise ValueError("the events must be subsets of the possibility "
+                             "space " + str(set(pspace)))
+        table = (1 << n) * [Fraction(0)]
+        for event, value in masses.items():
+            table[sum(1 << pspace.index(x) for x in event)] += value
+        for i in range(0, n): # sum over subsets
+            bit = 1 << i
+            for mask in range(0, 1 << n):
+                if mask & bit:
+                    table[mask] += table[mask ^ bit]
+        L = LowerProbability({frozenset(x for i, x in enumerate(pspace.states)
+                                        if mask & (1 << i)): value
+                              for mask, value in enumerate(table) if value},
+                             pspace)
+        object.__setattr__(L, '_table', table)
+        object.__setattr__(L, '_monotone', True)
+        return L
+
+    def _bounds(self):
+        """The bounds on the probabilities of the states that follow from the
+        assessments of states and their complements, as lists in the order of
+        the states, and whether there are no other assessments"""
+        def bounds():
+            n = len(self._pspace)
+            lower = n * [Fraction(0)]
+            upper = n * [Fraction(1)]
+            only = True
+            for event, value in self._mapping.items():
+                if len(event) == 1:
+                    i = self._pspace.index(next(iter(event)))
+                    lower[i] = max(lower[i], value)
+                if len(event) == n - 1:
+                    i = self._pspace.index(next(iter(self._pspace - event)))
+                    upper[i] = min(upper[i], 1 - value)
+                only = only and len(event) in (1, n - 1)
+            return lower, upper, only
+        return self._cached('_intervals', bounds)
+
+    def _mask(self, event):
+        """The bitmask of an event"""
+        return sum(1 << self._pspace.index(x) for x in event)
+
+    def _completion(self):
+        """Lower bounds for the probabilities of all events, indexed by
+        bitmask: the largest assessment of a subset, or the bound that follows
+        from those of the states and their complements (see :meth:`_bounds`)
+        if that is larger"""
+        def complete():
+            n = len(self._pspace)
+            full = (1 << n) - 1
+            lower, upper, only = self._bounds()
+            low = (full + 1) * [Fraction(0)] # sums of bounds of the states
+            up = (full + 1) * [Fraction(0)]
+            for mask in range(1, full + 1):
+                bit = mask & -mask
+                low[mask] = low[mask ^ bit] + lower[bit.bit_length() - 1]
+                up[mask] = up[mask ^ bit] + upper[bit.bit_length() - 1]
+            table = [max(low[mask], 1 - up[full ^ mask])
+                     for mask in range(0, full + 1)]
+            for event, value in self._mapping.items():
+                mask = self._mask(event)
+                table[mask] = max(table[mask], value)
+            for mask in range(1, full + 1): # subsets come first
+                rest = mask
+                while rest:
+                    bit = rest & -rest
+                    table[mask] = max(table[mask], table[mask ^ bit])
+                    rest ^= bit
+            return table
+        return self._cached('_table', complete)
+
+    def lower_pr(self, event):
+        """The lower probability of an event, by natural extension
+
+          :arg `event`: the event
+          :type `event`: :class:`~collections.Iterable` of states
+          :rtype: :class:`~fractions.Fraction`
+
+        If the lower probability is found to be 2-monotone, this is the value
+        of the completion described for :meth:`is_2monotone`.
+
+        >>> L = LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'})
+        >>> L.lower_pr('abc'), L.lower_pr('ac'), L.upper_pr('a')
+        (Fraction(1, 1), Fraction(1, 10), Fraction(1, 2))
+
+        """
+        return self * (Gamble(frozenset(event)) | self._pspace)
+
+    def upper_pr(self, event):
+        """The upper probability of an event, by natural extension
+
+          :arg `event`: the event
+          :type `event`: :class:`~collections.Iterable` of states
+          :rtype: :class:`~fractions.Fraction`
+
+        """
+        return self ** (Gamble(frozenset(event)) | self._pspace)
+
+    def is_2monotone(self):
+        """Check whether the natural extension is found to be 2-monotone
+
+          :rtype: :class:`bool`
+
+        When only states and their complements are assessed, the natural
+        extension is 2-monotone if and only if the implied probability
+        intervals avoid sure loss (see :class:`ProbabilityIntervals`).
+        Otherwise, the lower probability is completed to all events by lower
+        bounds that hold for every compatible mass function: the largest
+        assessment of a subset, or, if larger, the bound that follows from the
+        assessments of states and their complements. If this completion is
+        normalized and satisfies :math:`Q(A\\cup B)+Q(A\\cap B)\\geq
+        Q(A)+Q(B)` for all events :math:`A` and :math:`B` (which only needs to
+        be checked for events that differ in one state), it is the natural
+        extension. The result is calculated only once.
+
+        >>> LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'}).is_2monotone()
+        True
+        >>> LowerProbability({'a': .1, 'b': .1}, 'abc').is_2monotone()
+        True
+        >>> LowerProbability({'ab': .5, 'cd': .5,
+        ...                   'ac': .5, 'bd': .5}).is_2monotone()
+        False
+
+        .. note::
+
+          A natural extension that is 2-monotone need not be recognized as
+          such, e.g., when it is not determined by the completion; the
+          natural extension is then calculated by linear programming (see
+          :meth:`get_desir`). Assessments that incur sure loss are recognized
+          before tabulating all events where possible, and possibility spaces
+          with more than 20 states are not tabulated at all.
+
+        """
+        def check():
+            lower, upper, only = self._bounds()
+            if only:
+                return _proper(lower, upper)
+            n = len(self._pspace)
+            if n > 20 or not _proper(lower, upper):
+                return False
+            if any(value > (1 if event else 0)
+                   for event, value in self._mapping.items()):
+                return False
+            table = self._completion()
+            full = (1 << n) - 1
+            if table[0] > 0 or table[full] > 1:
+                return False
+            for mask in range(0, full + 1):
+                free = [1 << i for i in range(0, n) if not mask & (1 << i)]
+                for k, bit in enumerate(free):
+                    for other in free[k + 1:]:
+                        if (table[mask | bit | other] + table[mask] <
+                            table[mask | bit] + table[mask | other]):
+                            return False
+            return True
+        return self._cached('_monotone', check)
+
+    def mobius(self):
+        """The Möbius inverse of the completed lower probability
+
+          :returns: the nonzero values of the Möbius inverse, which are all
+            nonnegative if and only if the lower probability is a belief
+            function
+          :rtype: :class:`~murasyp.functions.Function` of events
+
+        >>> m = LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'}).mobius()
+        >>> m[frozenset('a')], m[frozenset('bc')], m[frozenset('abc')]
+        (Fraction(1, 10), Fraction(1, 2), Fraction(1, 5))
+
+        """
+        n = len(self._pspace)
+        table = list(self._completion())
+        for i in range(0, n):
+            bit = 1 << i
+            for mask in range(0, 1 << n):
+                if mask & bit:
+                    table[mask] -= table[mask ^ bit]
+        return Function({frozenset(x for i, x in enumerate(self._pspace.states)
+                                   if mask & (1 << i)): value
+                         for mask, value in enumerate(table) if value != 0})
+
+    def _choquet(self, gamble):
+        """The Choquet integral of a gamble on the possibility space"""
+        table = self._completion()
+        states = sorted(self._pspace.states, key=lambda x: gamble[x])
+        mask = (1 << len(states)) - 1
+        value = gamble[states[0]]
+        for previous, x in zip(states, states[1:]):
+            mask ^= 1 << self._pspace.index(previous)
+            if gamble[x] != gamble[previous]:
+                value += (gamble[x] - gamble[previous]) * table[mask]
+        return value
+
+    def _closed_form(self, gamble):
+        """The lower prevision of a gamble if it can be calculated without
+        linear programming, and None otherwise"""
+        if gamble.domain() != self._pspace or not self.is_2monotone():
+            return None
+        lower, upper, only = self._bounds()
+        if only:
+            return _greedy(lower, upper,
+                           [gamble[x] for x in self._pspace.states])
+        return self._choquet(gamble)
+
+    def __mul__(self, other):
+        """Lower expectation of a gamble"""
+        if isinstance(other, Gamble):
+            return self.lower_previsions([other])[0]
+        else:
+            return Function.__mul__(self, other)
+
+    def __pow__(self, other):
+        """Upper expectation of a gamble"""
+        return - self.__mul__(- other)
+
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the lower previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        >>> L = LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'})
+        >>> L.lower_previsions([{'a': 1, 'b': 2, 'c': 3}, {'a': 1, 'b': 0}])
+        [Fraction(3, 2), Fraction(1, 10)]
+
+        """
+        gambles = [Gamble(gamble) for gamble in gambles]
+        previsions = [self._closed_form(gamble) for gamble in gambles]
+        others = [n for n, value in enumerate(previsions) if value is None]
+        if others:
+            D = self._cached('_desir', lambda: self.get_desir().compile())
+            values = D.lower_previsions(gambles[n] for n in others)
+            for n, value in zip(others, values):
+                previsions[n] = Fraction(value)
+        return previsions
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of arguments
+            accepted by the :class:`~murasyp.gambles.Gamble` constructor
+          :returns: the upper previsions, in the order of the gambles
+          :rtype: :class:`list`
+
+        See :meth:`lower_previsions`, in terms of which this is calculated.
+
+        """
+        return [- value for value
+                in self.lower_previsions(- Gamble(gamble)
+                                         for gamble in gambles)]
+
+    def get_desir(self):
+        """Generate the corresponding set of desirable gambles
+
+          :returns: the set of desirable gambles containing the positive gambles
+            and, for each event, the gambles whose lower probability assessment
+            it expresses (see :meth:`~murasyp.desirs.DesirSet.set_lower_pr`)
+          :rtype: :class:`~murasyp.desirs.DesirSet`
+
+        """
+        D = murasyp.desirs.DesirSet([self._pspace])
+        for event, value in self._mapping.items():
+            if event:
+                D.set_lower_pr(Gamble(event) | self._pspace, value)
+        return D
+
+    def get_credal(self):
+        """Generate the corresponding (closed) credal set
+
+          :rtype: :class:`~murasyp.credalsets.CredalSet`
+
+        >>> L = LowerProbability({'a': .1, 'ab': .3, 'bc': '1/2'})
+        >>> len(L.get_credal())
+        5
+
+        """
+        return self.get_desir().get_credal()
+
+
+class ProbabilityIntervals(LowerProbability):
+    """Probability intervals bound the probability of each state
+
+      :arg `lower`: the lower probabilities of states (zero if not given)
+      :type `lower`: :class:`~collections.Mapping` of states to a
+        representation of :class:`~numbers.Real`
+      :arg `upper`: the upper probabilities of states (one if not given)
+      :type `upper`: :class:`~collections.Mapping` of states to a
+        representation of :class:`~numbers.Real`
+      :arg `pspace`: the possibility space (by default, the states that are
+        given bounds)
+      :type `pspace`: :class:`~collections.Iterable` of states
+
+      >>> I = ProbabilityIntervals({'a': .1, 'b': .2, 'c': .3},
+      ...                          {'a': .2, 'b': .5, 'c': .5})
+      >>> I.lower_pr('b'), I.upper_pr('b')
+      (Fraction(3, 10), Fraction(1, 2))
+
+    This class derives from :class:`~murasyp.lowprobs.LowerProbability`: the
+    lower probability of each state is its lower bound, and that of the
+    complement of each state is one minus its upper bound.
+
+    Additional and changed methods:
+
+    * Lower and upper expectations of gambles on the possibility space are
+      calculated in closed form, by sorting the states according to the
+      gamble's values and greedily moving the free probability mass to the
+      worst (best) states; no linear programming is done unless the intervals
+      do not avoid sure loss (see :meth:`is_proper`) or the expectation is
+      conditional.
+
+      >>> f = Gamble({'a': 1, 'b': 2, 'c': 3})
+      >>> I * f, I ** f
+      (Fraction(21, 10), Fraction(12, 5))
+      >>> assert I * f == I.get_desir() * f and I ** f == I.get_desir() ** f
+
+    * The vertices of the credal set are enumerated combinatorially (see
+      :meth:`get_credal`).
+
+    """
+
+    __slots__ = ('_lower', '_upper')
+
+    def __init__(self, lower={}, upper={}, pspace=None):
+        """Create probability intervals"""
+        if isinstance(lower, ProbabilityIntervals):
+            if pspace is None:
+                pspace = lower._pspace
+            lower, upper = lower._lower, lower._upper
+        lower = Function(lower)
+        upper = Function(upper)
+        if pspace is None:
+            pspace = lower.domain() | upper.domain()
+        if not isinstance(pspace, PossibilitySpace):
+            pspace = PossibilitySpace(pspace)
+        if not (lower.domain() | upper.domain()) <= pspace:
+            raise ValueError("the states must belong to the possibility "
+                             "space " + str(set(pspace)))
+        events = {}
+        for event, value in ([(frozenset([x]), value)
+                              for x, value in lower.items()] +
+                             [(pspace - {x}, 1 - value)
+                              for x, value in upper.items()
+                              if len(pspace) > 1]):
+            events[event] = max(events.get(event, value), value)
+        LowerProbability.__init__(self, events, pspace)
+        object.__setattr__(self, '_lower', lower)
+        object.__setattr__(self, '_upper', upper)
+
+    def __reduce__(self):
+        return (type(self), (dict(self._lower._mapping),
+                             dict(self._upper._mapping), self._pspace.states))
+
+    def _bounds(self):
+        """The lower and upper bounds as given, as lists in the order of the
+        states, and that there are no other assessments"""
+        return self._cached('_intervals', lambda: (
+            [self._lower[x] if x in self._lower else Fraction(0)
+             for x in self._pspace.states],
+            [self._upper[x] if x in self._upper else Fraction(1)
+             for x in self._pspace.states],
+            True))
+
+    def bounds(self):
+        """The lower and upper probabilities of all states
+
+          :returns: the lower and upper bounds as given (so not necessarily
+            reachable), including the default ones
+          :rtype: a pair of :class:`~murasyp.functions.Function`
+
+        """
+        lower, upper, only = self._bounds()
+        return (Function(dict(zip(self._pspace.states, lower))),
+                Function(dict(zip(self._pspace.states, upper))))
+
+    def is_proper(self):
+        """Check whether the probability intervals avoid sure loss
+
+          :rtype: :class:`bool`
+
+        This is the case if each lower bound is at most the corresponding upper
+        bound, the lower bounds sum to at most one and the upper bounds to at
+        least one.
+
+        >>> ProbabilityIntervals({'a': .5, 'b': .6}).is_proper()
+        False
+
+        """
+        lower, upper, only = self._bounds()
+        return _proper(lower, upper)
+
+    def is_reachable(self):
+        """Check whether each bound is attained by some probability mass
+        function between the bounds
+
+          :rtype: :class:`bool`
+
+        >>> ProbabilityIntervals({'a': .1, 'b': .2, 'c': .3},
+        ...                      {'a': .2, 'b': .5, 'c': .5}).is_reachable()
+        False
+
+        """
+        if not self.is_proper():
+            return False
+        lower, upper, only = self._bounds()
+        low = sum(lower)
+        up = sum(upper)
+        return all(up - u + l >= 1 and low - l + u <= 1
+                   for l, u in zip(lower, upper))
+
+    def reachable(self):
+        """Correct the probability intervals to make them reachable
+
+          :returns: the tightest probability intervals with the same credal
+            set, i.e., those of the natural extension
+          :rtype: :class:`~murasyp.lowprobs.ProbabilityIntervals`
+          :raises: :exc:`~exceptions.ValueError` if the probability intervals
+            do not avoid sure loss
+
+        >>> I = ProbabilityIntervals({'a': .1, 'b': .2, 'c': .3},
+        ...                          {'a': .2, 'b': .5, 'c': .5})
+        >>> J = I.reachable()
+        >>> J.bounds()[0]['b']
+        Fraction(3, 10)
+        >>> f = Gamble({'a': 1, 'b': 2, 'c': 3})
+        >>> assert J.is_reachable() and J * f == I * f
+
+        """
+        if not self.is_proper():
+            raise ValueError("probability intervals that incur sure loss "
+                             "cannot be made reachable")
+        lower, upper, only = self._bounds()
+        low = sum(lower)
+        up = sum(upper)
+        states = self._pspace.states
+        return type(self)({x: max(l, 1 - up + u)
+                           for x, l, u in zip(states, lower, upper)},
+                          {x: min(u, 1 - low + l)
+                           for x, l, u in zip(states, lower, upper)},
+                          self._pspace)
+
+    def get_desir(self):
+        """Generate the corresponding set of desirable gambles
+
+          :returns: the set of desirable gambles containing the positive gambles
+            and, for each state that is given bounds, the gambles expressing
+            them (see :meth:`~murasyp.desirs.DesirSet.set_lower_pr` and
+            :meth:`~murasyp.desirs.DesirSet.set_upper_pr`)
+          :rtype: :class:`~murasyp.desirs.DesirSet`
+
+        """
+        D = murasyp.desirs.DesirSet([self._pspace])
+        for x, value in self._lower.items():
+            D.set_lower_pr(Gamble({x}) | self._pspace, value)
+        for x, value in self._upper.items():
+            D.set_upper_pr(Gamble({x}) | self._pspace, value)
+        return D
+
+    def get_credal(self):
+        """Generate the corresponding (closed) credal set
+
+          :rtype: :class:`~murasyp.credalsets.CredalSet`
+
+        The vertices are enumerated by a depth-first search over the states in
+        which all probabilities but at most one are fixed at one of their
+        bounds and the remaining one takes up the rest of the mass, pruning
+        branches that can no longer lead to a total mass of one.
+
+        >>> I = ProbabilityIntervals({'a': .1, 'b': .2, 'c': .3},
+        ...                          {'a': .2, 'b': .5, 'c': .5})
+        >>> assert I.get_credal() == I.get_desir().get_credal()
+        >>> len(I.get_credal())
+        4
+
+        """
+        if not self.is_proper():
+            return LowerProbability.get_credal(self)
+        lower, upper, only = self._bounds()
+        states = self._pspace.states
+        n = len(states)
+        low = n * [Fraction(0)] + [Fraction(0)] # sums of the remaining bounds
+        up = n * [Fraction(0)] + [Fraction(0)]
+        for i in reversed(range(0, n)):
+            low[i] = low[i + 1] + lower[i]
+            up[i] = up[i + 1] + upper[i]
+        vertices = set()
+        values = n * [None]
+        def search(i, mass, free):
+            slack = (0, 0) if free is None else (lower[free], upper[free])
+            if not mass + low[i] + slack[0] <= 1 <= mass + up[i] + slack[1]:
+                return
+            if i == n:
+                if free is not None:
+                    values[free] = 1 - mass
+                vertices.add(tuple(values))
+                return
+            for value in {lower[i], upper[i]}:
+                values[i] = value
+                search(i + 1, mass + value, free)
+            if free is None:
+                search(i + 1, mass, i)
+        search(0, Fraction(0), None)
+        return murasyp.credalsets.CredalSet(dict(zip(states, vertex))
+                                            for vertex in vertices)
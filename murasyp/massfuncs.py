@@ -1,5 +1,7 @@
 from __future__ import division
 from collections import Set, Mapping
+from fractions import Fraction
+from murasyp.functions import _common_denominator
 from murasyp.vectors import Vector
 from murasyp.gambles import Gamble
 
@@ -75,17 +77,25 @@ class UMFunc(Vector):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, data={}):
         """Create a unit mass function"""
-        if isinstance(data, Mapping):  # Hashable Mapping to Rational
-            umfunc = Vector(data).sum_normalized()
-            if umfunc == None:
+        if isinstance(data, UMFunc): # already normalized
+            self._set_mapping(data._mapping)
+        elif isinstance(data, Mapping):  # Hashable Mapping to Rational
+            args, values = self._parse_items(data)
+            numerators, denominator = _common_denominator(values)
+            mass = sum(numerators)
+            if mass == 0:
                 raise ValueError("no UMFunc can be constructed from a Mapping "
                                 + str(data) + " with a total mass of zero")
-            Vector.__init__(self, umfunc | umfunc.support())
+            self._set_mapping({arg: Fraction(numerator, mass)
+                               for arg, numerator in zip(args, numerators)
+                               if numerator != 0})
         else: # uniform over Hashable Container
-            Vector.__init__(self, {component: 1 / self._make_rational(len(data))
-                                   for component in data})
+            value = Fraction(1, len(data))
+            self._set_mapping({component: value for component in data})
 
     def __or__(self, other):
         """Mass function conditional on the given event"""
@@ -124,6 +134,8 @@ class PMFunc(UMFunc):
 
     """
 
+    __slots__ = ()
+
     def __init__(self, data):
         """Create a probability mass function"""
         UMFunc.__init__(self, data)
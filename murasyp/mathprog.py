@@ -1,138 +1,990 @@
+from collections import OrderedDict
+from fractions import Fraction
+from functools import reduce
+from math import gcd
+from threading import Lock
+from murasyp.functions import _common_denominator
 from murasyp.vectors import Vector, Polytope
 from cdd import Matrix, RepType, Polyhedron, LPObjType, LinProg, LPStatusType
 
-def vf_enumeration(data=[]):
+class _LinearProgram(object):
+    """A linear program in cdd form, independent of the number type
+
+    The rows ``[b, a_1, ..., a_n]`` express constraints :math:`b + a x\\geq 0`,
+    or :math:`b + a x = 0` for the rows listed as linear; the objective
+    ``(c_0, c_1, ..., c_n)`` is maximized.
+
+    """
+    def __init__(self, rows, linear=False):
+        self.rows = []
+        self.linear = []
+        self.objective = None
+        self.extend(rows, linear)
+
+    def extend(self, rows, linear=False):
+        """Add constraint rows"""
+        if linear:
+            self.linear.extend(range(len(self.rows),
+                                     len(self.rows) + len(rows)))
+        self.rows.extend(rows)
+
+    def matrix(self, number_type='fraction'):
+        """The corresponding cdd matrix"""
+        convert = float if number_type == 'float' else lambda value: value
+        linear = frozenset(self.linear)
+        rows = [[convert(value) for value in row] for row in self.rows]
+        mat = Matrix([row for i, row in enumerate(rows) if i not in linear]
+                     or [len(self.objective) * [0]], # cdd needs a first row
+                     number_type=number_type)
+        if self.linear:
+            mat.extend([rows[i] for i in self.linear], linear=True)
+        mat.obj_type = LPObjType.MAX
+        mat.obj_func = tuple(convert(value) for value in self.objective)
+        return mat
+
+
+class CddBackend(object):
+    """Exact linear programming and vertex/facet enumeration using pycddlib
+
+    This is the default backend of :func:`feasible`, :func:`maximize`, and
+    :func:`vf_enumeration`; all calculations use rational arithmetic.
+
+    """
+    def solve(self, program):
+        """Solve a linear program
+
+          :returns: the status (a :class:`~cdd.LPStatusType`), the optimal
+            value, and the optimal primal solution
+
+        """
+        lp = LinProg(program.matrix('fraction'))
+        lp.solve()
+        return lp.status, lp.obj_value, lp.primal_solution
+
+    def generators(self, rows):
+        """Generators of the polyhedral cone given by inequality rows
+
+          :returns: the cdd generator matrix
+
+        """
+        mat = Matrix(rows, number_type='fraction')
+        mat.rep_type = RepType.INEQUALITY
+        return Polyhedron(mat).get_generators()
+
+
+class CertifiedFloatBackend(CddBackend):
+    """Floating-point linear programming with exact certification
+
+    Linear programs are first solved using pycddlib's floating-point
+    arithmetic. From the (approximate) optimal solution, the tight constraints
+    are determined; an exact rational primal solution is calculated from a
+    square basic subsystem of them, an exact dual solution on the same basis
+    (or, failing that, on the support of an approximate dual solution), and
+    these are checked to form an optimality certificate. If that check fails
+    (or the floating-point solver does not find an optimum), the linear
+    program is solved with the exact :class:`CddBackend`, so the results are
+    always exact. This pays off for larger linear programs only; for small
+    ones, or ones that are often infeasible, the overhead makes it slower than
+    the exact backend, which is why that remains the default.
+
+    Vertex/facet enumeration is always done exactly.
+
+    It can be used for specific calls (with the `backend` argument) or
+    installed as `default_backend`:
+
+    >>> import murasyp.mathprog
+    >>> from murasyp.gambles import Gamble
+    >>> from murasyp.desirs import DesirSet
+    >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+    ...                Gamble({'a': 1, 'c': '-1/30'}),
+    ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+    ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+    >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+    >>> murasyp.mathprog.cache.clear()
+    >>> murasyp.mathprog.default_backend = CertifiedFloatBackend()
+    >>> D * f
+    Fraction(-1, 25)
+    >>> murasyp.mathprog.default_backend.certified > 0
+    True
+    >>> murasyp.mathprog.default_backend = CddBackend()
+
+    """
+    tolerance = 1e-9
+
+    def __init__(self):
+        self.certified = 0 # number of certified floating-point solutions
+        self.fallbacks = 0 # number of exact solves
+
+    def solve(self, program):
+        lp = LinProg(program.matrix('float'))
+        lp.solve()
+        if lp.status == LPStatusType.OPTIMAL:
+            solution = _certify(program, lp.primal_solution, self.tolerance)
+            if solution is not None:
+                self.certified += 1
+                return solution
+        self.fallbacks += 1
+        return CddBackend.solve(self, program)
+
+
+default_backend = CddBackend()
+
+class LRUCache(object):
+    """A least-recently-used cache of results with hit/miss statistics
+
+      :arg `maxsize`: the maximal number of results kept; when it is exceeded,
+        the least recently used result is evicted; zero disables caching
+      :type `maxsize`: :class:`int`
+
+    The module-level instance `cache` is used by :func:`feasible` and
+    :func:`maximize`, keyed on a canonical form of their arguments (the
+    frozenset of cones and the vectors involved), so that it does not depend
+    on the order in which cones, rays, or values are given.
+
+    >>> cache.clear()
+    >>> D = [[{'a': -1, 'b': 1}], [{'a': 1, 'b': -2}]]
+    >>> feasible(D) == feasible(reversed(D))
+    True
+    >>> cache.info()
+    (1, 1, 256, 1)
+
+    """
+    def __init__(self, maxsize=256):
+        self._results = OrderedDict()
+        self._lock = Lock() # not held during computations
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, compute):
+        """The cached result for the key, computed and stored if absent"""
+        with self._lock:
+            found = key in self._results
+            if found:
+                self.hits += 1
+                result = self._results.pop(key)
+                self._results[key] = result
+            else:
+                self.misses += 1
+        if not found:
+            result = compute()
+            with self._lock:
+                if self.maxsize > 0:
+                    self._results[key] = result
+                    self._evict()
+        return result
+
+    def _evict(self):
+        """Evict least recently used results until the size is respected"""
+        while len(self._results) > max(self.maxsize, 0):
+            self._results.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change the maximal number of results, evicting as necessary"""
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Invalidate all results and reset the statistics"""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Statistics of the cache
+
+          :returns: the number of hits, the number of misses, the maximal
+            size, and the current size
+          :rtype: :class:`tuple`
+
+        """
+        return (self.hits, self.misses, self.maxsize, len(self._results))
+
+
+cache = LRUCache()
+
+def _exact(value):
+    """Rational value, represented as cdd does (integers as int)"""
+    return value.numerator if value.denominator == 1 else value
+
+def _integer_row(row):
+    """The nonzero entries of a row, scaled to coprime integers
+
+      :returns: the entries, keyed on their index in the row
+      :rtype: :class:`dict`
+
+    """
+    entries = [(i, Fraction(value)) for i, value in enumerate(row)
+                                    if value != 0]
+    numerators, denominator = _common_denominator(value
+                                                  for i, value in entries)
+    return _primitive({i: value for (i, entry), value
+                                in zip(entries, numerators)})
+
+def _primitive(row):
+    """Integer row divided by the greatest common divisor of its entries"""
+    divisor = reduce(gcd, row.values(), 0)
+    if divisor > 1:
+        return {i: value // divisor for i, value in row.items()}
+    return row
+
+def _solve_linear_system(equations, guesses):
+    """Exact solution of a square basic subsystem of a system of linear
+    equations
+
+      :arg `equations`: rows ``[b, a_1, ..., a_n]`` expressing the equations
+        :math:`b + a z = 0`
+      :arg `guesses`: values for the unknowns, used for free unknowns
+      :returns: a solution (a :class:`list` of :class:`~fractions.Fraction`)
+        and the indices of the equations of the basic subsystem, or ``None``
+        if the equations taken are inconsistent
+
+    The equations are taken sparsest first, skipping those that depend on the
+    ones taken before, until there are as many independent equations as
+    unknowns; the others are not looked at, so the solution must be checked
+    against them. The elimination is fraction-free: rows are kept as sparse
+    integer rows divided by their content, and fractions only appear in the
+    back substitution.
+
+    """
+    n = len(guesses)
+    pivots = [] # pairs of a column and its (integer) pivot row
+    basis = []
+    for k in sorted(range(0, len(equations)),
+                    key=lambda k: sum(1 for a in equations[k][1:] if a != 0)):
+        row = _integer_row(equations[k])
+        for column, pivot in pivots:
+            a = row.get(column, 0)
+            if a != 0:
+                divisor = gcd(a, pivot[column])
+                p, a = pivot[column] // divisor, a // divisor
+                combination = {i: p * value for i, value in row.items()}
+                for i, value in pivot.items():
+                    combination[i] = combination.get(i, 0) - a * value
+                row = _primitive({i: value for i, value in combination.items()
+                                     if value != 0})
+        columns = [i for i in row if i != 0]
+        if columns == []:
+            if 0 in row:
+                return None
+            continue
+        pivots.append((min(columns, key=lambda i: abs(row[i])), row))
+        basis.append(k)
+        if len(pivots) == n:
+            break
+    solution = [Fraction(guess) for guess in guesses]
+    for column, row in reversed(pivots):
+        solution[column - 1] = -Fraction(row.get(0, 0) + sum(
+                                   value * solution[i - 1]
+                                   for i, value in row.items()
+                                   if i != 0 and i != column), row[column])
+    return solution, basis
+
+def _dual_solution(program, support, slacks):
+    """Exact dual solution on the given constraints for an exact primal
+    solution with the given slacks
+
+      :returns: the values :math:`y_i` for the constraints in `support` such
+        that :math:`c + \\sum_i y_i a_i = 0`, nonnegative for inequalities and
+        zero for constraints that are not tight, or ``None`` if there are none
+
+    """
+    linear = frozenset(program.linear)
+    objective = program.objective
+    equations = [[objective[j]] + [program.rows[i][j] for i in support]
+                 for j in range(1, len(objective))]
+    solved = _solve_linear_system(equations, len(support) * [0])
+    if solved is None:
+        return None
+    dual = solved[0]
+    if any(y < 0 for i, y in zip(support, dual) if i not in linear):
+        return None
+    if any(y != 0 and slacks[i] != 0 for i, y in zip(support, dual)):
+        return None # not complementary
+    if any(row[0] + sum(a * y for a, y in zip(row[1:], dual) if a != 0) != 0
+           for row in equations):
+        return None
+    return dual
+
+def _certify(program, approximation, tolerance):
+    """Exact optimality certificate from an approximate optimal solution
+
+      :returns: the status, optimal value, and optimal primal solution, or
+        ``None`` if no certificate could be found
+
+    """
+    rows = program.rows
+    linear = frozenset(program.linear)
+    n = len(program.objective) - 1
+    entries = [[(j, a) for j, a in enumerate(row) if j != 0 and a != 0]
+               for row in rows] # the nonzero coefficients of the rows
+    # determine the tight constraints from the approximate solution
+    tight = []
+    for i, row in enumerate(rows):
+        slack = float(row[0]) + sum(float(a) * approximation[j - 1]
+                                    for j, a in entries[i])
+        scale = 1 + abs(float(row[0])) + sum(abs(float(a))
+                                              for j, a in entries[i])
+        if i in linear or abs(slack) <= tolerance * scale:
+            tight.append(i)
+    # exact primal solution of a basic subsystem, checked for feasibility
+    solved = _solve_linear_system([rows[i] for i in tight],
+                                  [Fraction(value).limit_denominator(10 ** 9)
+                                   for value in approximation])
+    if solved is None:
+        return None
+    primal, basis = solved[0], [tight[k] for k in solved[1]]
+    slacks = []
+    for i, row in enumerate(rows):
+        slack = row[0] + sum(a * primal[j - 1] for j, a in entries[i])
+        if slack < 0 or (i in linear and slack != 0):
+            return None
+        slacks.append(slack)
+    # exact dual solution on the basis, or else on the support of an
+    # approximate dual solution on the tight constraints
+    objective = program.objective
+    if _dual_solution(program, basis, slacks) is None:
+        dual_program = _LinearProgram([[objective[j]]
+                                       + [rows[i][j] for i in tight]
+                                       for j in range(1, n + 1)], linear=True)
+        dual_program.extend(_unit_rows(1 + len(tight),
+                                       [1 + t for t, i in enumerate(tight)
+                                              if i not in linear]))
+        dual_program.objective = [0] + [-rows[i][0] for i in tight]
+        lp = LinProg(dual_program.matrix('float'))
+        lp.solve()
+        if lp.status != LPStatusType.OPTIMAL:
+            return None
+        support = [tight[t] for t, y in enumerate(lp.primal_solution)
+                            if abs(y) > tolerance]
+        if _dual_solution(program, support, slacks) is None:
+            return None
+    value = objective[0] + sum(c * x for c, x in zip(objective[1:], primal))
+    return (LPStatusType.OPTIMAL, _exact(value),
+            tuple(_exact(x) for x in primal))
+
+def vf_enumeration(data=[], backend=None):
     """Perform vertex/facet enumeration
 
       :type `data`: an argument accepted by the
         :class:`~murasyp.vectors.Polytope` constructor.
+      :arg `backend`: the backend to use (by default, `default_backend`)
 
     :returns: the vertex/facet enumeration of the polytope (assumed to be in
       facet/vertex-representation)
     :rtype: a :class:`~murasyp.vectors.Polytope`
 
     """
+    return Polytope(vf_stream(data, backend))
+
+def vf_stream(data=[], backend=None):
+    """Perform vertex/facet enumeration, generating the results one by one
+
+      :type `data`: an argument accepted by the
+        :class:`~murasyp.vectors.Polytope` constructor.
+      :arg `backend`: the backend to use (by default, `default_backend`)
+
+    :returns: the vertices/facets of the polytope (assumed to be in
+      facet/vertex-representation), as for :func:`vf_enumeration`, but with
+      each vector created only when it is needed
+    :rtype: a generator of :class:`~murasyp.vectors.Vector`
+
+    Only the backend's result matrix is kept in memory in full; the vectors can
+    be passed on directly to, e.g., the
+    :class:`~murasyp.credalsets.CredalSet` constructor, or be processed and
+    dropped one at a time. Vectors may be generated more than once.
+
+    >>> P = Polytope([{'a': 1}, {'b': 1}])
+    >>> assert Polytope(vf_stream(P)) == vf_enumeration(P)
+    >>> sum(1 for vector in vf_stream(P))
+    2
+
+    """
+    backend = default_backend if backend is None else backend
     vf_poly = Polytope(data)
     coordinates = list(vf_poly.domain())
-    mat = Matrix(list([0] + [vector[x] for x in coordinates]
-                      for vector in vf_poly),
-                 number_type='fraction')
-    mat.rep_type = RepType.INEQUALITY
-    poly = Polyhedron(mat)
-    ext = poly.get_generators()
-    fv_poly = Polytope([{coordinates[j-1]: ext[i][j]
-                         for j in range(1, ext.col_size)}
-                        for i in range(0, ext.row_size)] +
-                       [{coordinates[j-1]: -ext[i][j]
-                         for j in range(1, ext.col_size)}
-                        for i in ext.lin_set])
-    return fv_poly
-
-def feasible(data, mapping=None):
+    ext = backend.generators(list([0] + [vector[x] for x in coordinates]
+                                  for vector in vf_poly))
+    lin_set = ext.lin_set
+    for i in range(0, ext.row_size):
+        values = ext[i][1:]
+        yield Vector(dict(zip(coordinates, values)))
+        if i in lin_set: # linearities generate both directions
+            yield Vector({x: -value for x, value in zip(coordinates, values)})
+
+def _dot(u, v):
+    """Inner product of two coordinate tuples"""
+    return sum(a * b for a, b in zip(u, v) if a != 0)
+
+def _dd_step(generators, inequalities, v):
+    """Add an inequality to a pointed, full-dimensional cone
+
+      :arg `generators`: the extreme rays of the cone
+      :arg `inequalities`: the facets of the cone
+      :arg `v`: the inequality :math:`v x\geq 0` to add
+      :returns: the extreme rays and facets of the intersection, or ``None``
+        if that is not full-dimensional
+
+    This is a step of the double description method, with the combinatorial
+    adjacency test: two extreme rays are adjacent if no third one lies on all
+    facets that both lie on.
+
+    """
+    values = [_dot(v, g) for g in generators]
+    plus = [i for i, value in enumerate(values) if value > 0]
+    if plus == []:
+        return None
+    minus = [i for i, value in enumerate(values) if value < 0]
+    zeros = [frozenset(j for j, h in enumerate(inequalities) if _dot(h, g) == 0)
+             for g in generators]
+    d = len(v)
+    new = [g for g, value in zip(generators, values) if value >= 0]
+    for i in plus:
+        for k in minus:
+            common = zeros[i] & zeros[k]
+            if len(common) < d - 2 or any(common <= zeros[m]
+                                          for m in range(len(generators))
+                                          if m != i and m != k):
+                continue
+            ray = tuple(values[i] * a - values[k] * b
+                        for a, b in zip(generators[k], generators[i]))
+            norm = max(abs(a) for a in ray)
+            new.append(tuple(Fraction(a) / norm for a in ray))
+    # the facets are the inequalities whose faces are maximal
+    inequalities = inequalities + [v]
+    faces = [frozenset(j for j, g in enumerate(new) if _dot(h, g) == 0)
+             for h in inequalities]
+    facets = []
+    seen = set()
+    for h, face in zip(inequalities, faces):
+        if face not in seen and not any(face < other for other in faces):
+            seen.add(face)
+            facets.append(h)
+    return new, facets
+
+
+class DoubleDescription(object):
+    """Both representations of a polyhedral cone, updated incrementally
+
+      :type `data`: an argument accepted by the
+        :class:`~murasyp.vectors.Polytope` constructor
+      :arg `backend`: the backend to use for full enumerations (by default,
+        `default_backend`)
+
+    The vectors `data` are the inequalities of the cone; its generators are
+    their vertex/facet enumeration (see :func:`vf_enumeration`), and vice
+    versa. Both are kept without redundant elements, and can be extended one
+    vector at a time: a vector that does not change the cone, as it satisfies
+    all inequalities or generators on the other side, is ignored; otherwise,
+    for cones that are pointed and full-dimensional on both sides, a single
+    step of the double description method is done, using exact arithmetic. In
+    the remaining cases, or when a vector involves new coordinates, the
+    enumeration is redone from the current irredundant representation
+    (counted in `rebuilds`).
+
+    >>> P = DoubleDescription([{'a': 1}, {'b': 1}, {'c': 1}])
+    >>> P.rebuilds
+    1
+    >>> P.add_inequality({'a': 1, 'b': -1})
+    >>> P.add_inequality({'a': 2, 'b': -1}) # implied by the previous ones
+    >>> P.add_generator({'a': 1, 'b': 1, 'c': 1}) # already generated
+    >>> assert (
+    ...     CredalSet(P.generators()) ==
+    ...     CredalSet(vf_enumeration([{'a': 1}, {'b': 1}, {'c': 1},
+    ...                               {'a': 1, 'b': -1}]))
+    ... )
+    >>> len(P.inequalities()), P.rebuilds
+    (3, 1)
+
+    .. note::
+
+      Generators and inequalities are determined up to a positive scaling
+      factor only.
+
+    """
+    def __init__(self, data=[], backend=None):
+        self.backend = default_backend if backend is None else backend
+        self.rebuilds = 0
+        vectors = Polytope(data)
+        self._rebuild(list(vectors.domain()), vectors, True)
+
+    def _rebuild(self, coordinates, vectors, inequality):
+        """Enumerate both sides, starting from the inequalities or generators"""
+        self.rebuilds += 1
+        self._coordinates = coordinates
+        rows = [tuple(vector[x] for x in coordinates) for vector in vectors]
+        other, lineality = self._enumerate(rows)
+        if not lineality: # remove redundant vectors
+            rows, lineality = self._enumerate(other)
+        self._pointed = not lineality
+        if inequality:
+            self._inequalities, self._generators = rows, other
+        else:
+            self._generators, self._inequalities = rows, other
+
+    def _enumerate(self, rows):
+        """The vertex/facet enumeration of coordinate tuples, and whether it
+        contains linearities"""
+        if rows == []:
+            return [], True
+        ext = self.backend.generators([[0] + list(row) for row in rows])
+        result = [tuple(ext[i][1:]) for i in range(0, ext.row_size)]
+        result += [tuple(-a for a in result[i]) for i in ext.lin_set]
+        return result, bool(ext.lin_set)
+
+    def _vector(self, row):
+        return Vector(dict(zip(self._coordinates, row)))
+
+    def inequalities(self):
+        """The irredundant inequalities of the cone
+
+          :rtype: :class:`~murasyp.vectors.Polytope`
+
+        """
+        return Polytope(self._vector(row) for row in self._inequalities)
+
+    def generators(self):
+        """The irredundant generators of the cone
+
+          :rtype: :class:`~murasyp.vectors.Polytope`
+
+        """
+        return Polytope(self._vector(row) for row in self._generators)
+
+    def add_inequality(self, mapping):
+        """Add an inequality, intersecting the cone with a halfspace
+
+          :type `mapping`: an argument accepted by the
+            :class:`~murasyp.vectors.Vector` constructor
+
+        """
+        self._add(Vector(mapping), True)
+
+    def add_generator(self, mapping):
+        """Add a generator, extending the cone
+
+          :type `mapping`: an argument accepted by the
+            :class:`~murasyp.vectors.Vector` constructor
+
+        """
+        self._add(Vector(mapping), False)
+
+    def _add(self, vector, inequality):
+        """Add an inequality or generator"""
+        same = self._inequalities if inequality else self._generators
+        if not vector.domain() <= frozenset(self._coordinates):
+            self._rebuild(list(vector.domain().union(self._coordinates)),
+                          [self._vector(row) for row in same] + [vector],
+                          inequality)
+            return
+        v = tuple(vector[x] for x in self._coordinates)
+        other = self._generators if inequality else self._inequalities
+        if all(_dot(v, row) >= 0 for row in other):
+            return # the cone does not change
+        step = self._pointed and _dd_step(other, same, v)
+        if step:
+            if inequality:
+                self._generators, self._inequalities = step
+            else:
+                self._inequalities, self._generators = step
+        else:
+            self._rebuild(self._coordinates,
+                          [self._vector(row) for row in same] + [vector],
+                          inequality)
+
+def _ray_offsets(cones):
+    """Number the rays of a list of cones consecutively
+
+      :returns: the column of the first ray of each cone, where column zero is
+        reserved for the constant, and the total number of rays
+
+    """
+    offsets = []
+    column = 1
+    for cone in cones:
+        offsets.append(column)
+        column += len(cone)
+    return offsets, column - 1
+
+def _cone_constraint_rows(cones, coordinates, width, constant={}):
+    """The rows expressing that a combination of rays equals a vector
+
+    Only the nonzero ray components are visited; the rows are filled in
+    column-wise from the sparse ray representations.
+
+    """
+    index = {x: i for i, x in enumerate(coordinates)}
+    rows = [[-constant[x] if x in constant else 0] + (width - 1) * [0]
+            for x in coordinates]
+    column = 1
+    for cone in cones:
+        for ray in cone:
+            for x, value in ray.items():
+                if value != 0:
+                    rows[index[x]][column] = value
+            column += 1
+    return rows
+
+def _unit_rows(width, columns, constant=0, coefficient=1):
+    """Rows with a single nonzero coefficient, one for each given column"""
+    rows = []
+    for column in columns:
+        row = [constant] + (width - 1) * [0]
+        row[column] = coefficient
+        rows.append(row)
+    return rows
+
+def feasible(data, mapping=None, backend=None):
     """Check feasibility using the CONEstrip algorithm
 
+      :arg `backend`: the backend to use (by default, `default_backend`)
+
       .. todo::
 
         document, test more and clean up
 
     """
-    D = set(Polytope(A) for A in data)
+    backend = default_backend if backend is None else backend
+    D = frozenset(Polytope(A) for A in data)
     if (mapping == None) or all(mapping[x] != 0 for x in mapping):
         h = None
     else:
         h = Vector(mapping)
-        D.add(Polytope({-h}))
-    coordinates = list(frozenset.union(*(A.domain() for A in D)))
+    return set(cache.lookup(('feasible', D, h),
+                            lambda: frozenset(_feasible(D, h, backend))))
+
+def positive_witness(data, backend=None):
+    """Find a strictly positive mass function on which all cones are positive
+
+      :type `data`: as for :func:`feasible`
+      :arg `backend`: the backend to use (by default, `default_backend`)
+      :returns: a mass function (as a vector) that is positive on all states
+        and that gives a nonnegative value to all rays and a positive value to
+        (some ray of) each cone, or ``None`` if none was found
+      :rtype: :class:`~murasyp.vectors.Vector`
+
+    Such a mass function certifies that no positive linear combination of
+    elements of the cones is everywhere nonpositive (see :func:`feasible`),
+    and it remains a certificate as long as the cones added later are positive
+    on it as well.
+
+    >>> assert (
+    ...     positive_witness([[{'a': 1, 'b': -1}], [{'a': -1, 'b': 2}]]) ==
+    ...     Vector({'a': '3/5', 'b': '2/5'})
+    ... )
+    >>> positive_witness([[{'a': 1, 'b': -1}], [{'a': -1, 'b': 1}]])
+
+    """
+    backend = default_backend if backend is None else backend
+    D = [Polytope(A) for A in data]
+    coordinates = list(frozenset().union(*(A.domain() for A in D)))
+    n = len(coordinates)
+    width = n + 2 # (constant, mass function, bound t)
+    mat = _LinearProgram([[0] + [ray[x] for x in coordinates] + [0]
+                          for A in D for ray in A]) # rays are nonnegative
+    mat.extend([[0] + [sum(ray[x] for ray in A) for x in coordinates] + [-1]
+                for A in D]) # cones are at least t
+    mat.extend([[0] + [int(i == j) for j in range(n)] + [-1]
+                for i in range(n)]) # masses are at least t
+    mat.extend(_unit_rows(width, [n + 1], 1, -1)) # t <= 1
+    mat.extend([[-1] + n * [1] + [0]], linear=True) # the masses sum to one
+    mat.objective = tuple((n + 1) * [0] + [1]) # maximize t
+    status, value, sol = backend.solve(mat)
+    if status == LPStatusType.OPTIMAL and value > 0:
+        return Vector(dict(zip(coordinates, sol[:n])))
+    else:
+        return None
+
+def in_relative_interior(mapping, data, backend=None):
+    """Check whether a vector is a positive combination of all rays of a cone
+
+      :type `mapping`: an argument accepted by the
+        :class:`~murasyp.vectors.Vector` constructor
+      :type `data`: an argument accepted by the
+        :class:`~murasyp.vectors.Polytope` constructor
+      :arg `backend`: the backend to use (by default, `default_backend`)
+      :rtype: :class:`bool`
+
+    A positive multiple of the vector must be a combination of the rays in
+    which all of them have a positive coefficient, i.e., it must lie in the
+    relative interior of the cone they generate.
+
+    >>> in_relative_interior({'a': 1, 'b': 1}, [{'a': 1}, {'b': 1}])
+    True
+    >>> in_relative_interior({'a': 1}, [{'a': 1}, {'b': 1}])
+    False
+
+    """
+    backend = default_backend if backend is None else backend
+    v = Vector(mapping)
+    rays = list(Polytope(data))
+    coordinates = list(frozenset.union(v.domain(),
+                                       *(ray.domain() for ray in rays)))
+    m = len(rays)
+    width = m + 2 # (constant, mu, lambda)
+    mat = _LinearProgram(_unit_rows(width, range(1, width), -1)) # all >= 1
+    mat.extend([[0] + [ray[x] for ray in rays] + [-v[x]]
+                for x in coordinates], linear=True) # sum mu r = lambda v
+    mat.objective = tuple(width * [0])
+    status, value, sol = backend.solve(mat)
+    return status == LPStatusType.OPTIMAL
+
+def in_convex_hull(mapping, data, backend=None):
+    """Check whether a vector is a convex combination of given vectors
+
+      :type `mapping`: an argument accepted by the
+        :class:`~murasyp.vectors.Vector` constructor
+      :type `data`: an argument accepted by the
+        :class:`~murasyp.vectors.Polytope` constructor
+      :arg `backend`: the backend to use (by default, `default_backend`)
+      :rtype: :class:`bool`
+
+    >>> in_convex_hull({'a': '1/2', 'b': '1/2'}, [{'a': 1}, {'b': 1}])
+    True
+    >>> in_convex_hull({'a': 1, 'b': 1}, [{'a': 1}, {'b': 1}])
+    False
+
+    """
+    backend = default_backend if backend is None else backend
+    v = Vector(mapping)
+    vectors = list(Polytope(data))
+    coordinates = list(frozenset.union(v.domain(),
+                                       *(w.domain() for w in vectors)))
+    width = 1 + len(vectors) # (constant, lambda)
+    mat = _LinearProgram(_unit_rows(width, range(1, width))) # lambda >= 0
+    mat.extend([[-v[x]] + [w[x] for w in vectors] for x in coordinates]
+               + [[-1] + len(vectors) * [1]],
+               linear=True) # v is a convex combination
+    mat.objective = tuple(width * [0])
+    status, value, sol = backend.solve(mat)
+    return status == LPStatusType.OPTIMAL
+
+def _conestrip_program(E, h):
+    """The CONEstrip linear program for a list of cones (given as lists of
+    rays), with variables (mu, tau)
+
+      :returns: the program, the column of the first ray of each cone, and the
+        total number of rays
+
+    """
+    coordinates = list(frozenset().union(*(ray.domain()
+                                           for A in E for ray in A)))
+    k = len(E)
+    offsets, l = _ray_offsets(E)
+    width = 1 + l + k
+    taus = range(1 + l, width)
+    mat = _LinearProgram([width * [0]])
+    mat.extend(_cone_constraint_rows(E, coordinates, width),
+               linear=True) # cone-constraints
+    mat.extend(_unit_rows(width, range(1, 1 + l))) # mu >= 0
+    mat.extend(_unit_rows(width, taus, 1, -1)) # tau <= 1
+    mat.extend(_unit_rows(width, taus)) # tau >= 0
+    mat.extend([[-1] + l * [0] + k * [1]]) # (sum of tau_A) >= 1
+    rows = []
+    for n in range(0, k):
+        for column in range(offsets[n], offsets[n] + len(E[n])):
+            row = width * [0]
+            row[column] = 1
+            row[1 + l + n] = -1
+            rows.append(row)
+    mat.extend(rows) # tau_A <= mu_A for all A
+    if h != None: # mu_{-h} >= 1
+        row = [-1] + (width - 1) * [0]
+        for n in range(0, k):
+            if E[n] == [-h]:
+                row[offsets[n]] = 1
+        mat.extend([row])
+    mat.objective = tuple([0] + l * [0] + k * [1]) # (constant, mu, tau)
+    return mat, offsets, l
+
+def _feasible(D, h, backend):
+    """The CONEstrip algorithm proper (see :func:`feasible`)
+
+    Each iteration solves the linear program of the cones that have not been
+    stripped yet, so the programs shrink as cones are stripped.
+
+    .. note::
+
+      The programs are not warm-started: pycddlib's linear programs can only
+      be solved from scratch (:meth:`~cdd.LinProg.solve` takes no starting
+      basis), so updating the previous program in place, by fixing the
+      variables of stripped cones to zero, would only make each solve larger.
+
+    """
+    if h != None:
+        D = D | {Polytope({-h})}
     E = [[vector for vector in A] for A in D]
-    #print(E)
-    while (E != []):
-        k = len(E)
-        L = [len(A) for A in E]
-        l = sum(L)
-        mat = Matrix([[0] + l * [0] + k * [0]], number_type='fraction')
-        mat.extend([[0] + [v[x] for A in E for v in A] + k * [0]
-                    for x in coordinates],
-                   linear=True) # cone-constraints
-        mat.extend([[0] + [int(B == A and w == v) for B in E for w in B]
-                        + k * [0]
-                    for A in E for v in A]) # mu >= 0
-        mat.extend([[1] + l * [0] + [-int(B == A) for B in E]
-                    for A in E]) # tau <= 1
-        mat.extend([[0] + l * [0] + [int(B == A) for B in E]
-                    for A in E]) # tau >= 0
-        mat.extend([[-1] + l * [0] + k * [1]]) # (sum of tau_A) >= 1
-        mat.extend([[0] + [int(B == A and w == v) for B in E for w in B]
-                        + [-int(B == A) for B in E]
-                    for A in E for v in A]) # tau_A <= mu_A for all A
-        if h != None: # mu_{-h} >= 1
-            mat.extend([[-1] + [int(A == [-h]) for A in E for w in A]
-                             + k * [0]])
-        mat.obj_type = LPObjType.MAX
-        mat.obj_func = tuple([0] + l * [0] + k * [1]) # (constant, mu, tau)
-        #print(mat)
-        lp = LinProg(mat)
-        lp.solve()
-        if lp.status == LPStatusType.OPTIMAL:
-            sol = lp.primal_solution # (constant, mu, tau)
-            tau = sol[l:]
-            #print(tau)
-            mu = [sol[sum(L[0:n]):sum(L[0:n]) + L[n]] for n in range(0, k)]
-            #print(mu)
-            E = [E[n] for n in range(0, k) if tau[n] == 1]
-            #print(E)
-            if all(all(mu[n][m] == 0 for m in range(0, L[n]))
-                   for n in range(0, k) if tau[n] == 0):
-                E = {Polytope(A) for A in E}
-                #print(E)
-                if h != None:
-                    E = E - {Polytope([-h])}
-                    #print(E)
-                return E
-            else:
-                continue
-        else:
+    while E != []:
+        mat, offsets, l = _conestrip_program(E, h)
+        status, value, sol = backend.solve(mat)
+        if status != LPStatusType.OPTIMAL:
             return set()
-    else:
-        return set()
+        # sol is the primal solution (mu, tau)
+        tau = sol[l:]
+        mu = [sol[offsets[n] - 1:offsets[n] - 1 + len(A)]
+              for n, A in enumerate(E)]
+        kept = [A for n, A in enumerate(E) if tau[n] == 1]
+        if all(all(x == 0 for x in mu[n])
+               for n in range(0, len(E)) if tau[n] == 0):
+            E = {Polytope(A) for A in kept}
+            if h != None:
+                E = E - {Polytope([-h])}
+            return E
+        E = kept # strip the other cones
+    return set()
 
-def maximize(data, mapping={}, objective=(0, {})):
+def maximize(data, mapping={}, objective=(0, {}), backend=None):
     """Maximization using the CONEstrip algorithm
 
+      :arg `backend`: the backend to use (by default, `default_backend`)
+
       .. todo::
 
         document, test more and clean up
 
     """
-    E = feasible(data, mapping)
-    if E == set():
-        raise ValueError("The linear program is infeasible.")
-        #print("The linear program is infeasible.")
-        #return 0
-    l = sum(len(A) for A in E)
+    backend = default_backend if backend is None else backend
+    D = frozenset(Polytope(A) for A in data)
     h = Vector(mapping)
     goal = (objective[0], Vector(objective[1]))
+    return cache.lookup(('maximize', D, h, goal),
+                        lambda: _maximize(D, h, goal, backend))
+
+def maximize_batch(data, mappings, objective=(0, {}), backend=None):
+    """Maximization for several mappings using the CONEstrip algorithm
+
+      :arg `mappings`: the mappings, each as for :func:`maximize`
+      :type `mappings`: an :class:`~collections.Iterable`
+      :arg `backend`: the backend to use (by default, `default_backend`)
+      :returns: the maxima, in the order of the mappings
+      :rtype: :class:`list`
+
+    This uses a :class:`CompiledProgram`, so the feasibility (stripping) step
+    is shared by all mappings without zero values, and the constraint matrix is
+    built only once for each feasible set of cones.
+
+    >>> one = Vector({'a': 1, 'b': 1})
+    >>> D = [[{'a': 1}], [{'b': 1}], [one], [-one]]
+    >>> maximize_batch(D, [{'a': 1, 'b': 2}, {'a': 3, 'b': '-1/2'}],
+    ...                (0, {one: 1, -one: -1}))
+    [1, Fraction(-1, 2)]
+
+    """
+    return CompiledProgram(data, objective, backend).maximize_batch(mappings)
+
+
+class CompiledProgram(object):
+    """The static part of the maximization problems for a set of cones
+
+      :type `data`: as for :func:`maximize`
+      :arg `objective`: as for :func:`maximize`
+      :arg `backend`: the backend to use (by default, `default_backend`)
+
+    The cones are stripped (see :func:`feasible`) once, and for the resulting
+    set of cones the coordinates, the numbering of the rays, and the constraint
+    matrix are fixed; for each mapping passed to :meth:`maximize` only the
+    constants of the cone-constraints are filled in before solving. Mappings
+    with zero values may lead to a different stripping; the constraint
+    matrices built for those are kept as well.
+
+    >>> one = Vector({'a': 1, 'b': 1})
+    >>> program = CompiledProgram([[{'a': 1}], [{'b': 1}], [one], [-one]],
+    ...                           (0, {one: 1, -one: -1}))
+    >>> program.maximize({'a': 1, 'b': 2})
+    1
+    >>> program.maximize({'a': 0, 'b': 2})
+    0
+
+    """
+    def __init__(self, data, objective=(0, {}), backend=None):
+        self.backend = default_backend if backend is None else backend
+        self.cones = frozenset(Polytope(A) for A in data)
+        self.goal = (objective[0], Vector(objective[1]))
+        self._stripped = None # the feasible cones for mappings without zeros
+        self._skeletons = {}
+
+    def stripped(self):
+        """The cones kept by the CONEstrip algorithm for mappings without zero
+        values (see :func:`feasible`)
+
+          :rtype: :class:`frozenset`
+
+        """
+        if self._stripped is None:
+            self._stripped = frozenset(feasible(self.cones,
+                                                backend=self.backend))
+        return self._stripped
+
+    def maximize(self, mapping={}):
+        """Maximization for a mapping (see :func:`maximize`)"""
+        h = Vector(mapping)
+        if all(h[x] != 0 for x in h):
+            E = self.stripped()
+        else:
+            E = None
+        return cache.lookup(('maximize', self.cones, h, self.goal),
+                            lambda: _maximize(self.cones, h, self.goal,
+                                              self.backend, self._skeletons,
+                                              E))
+
+    def maximize_batch(self, mappings):
+        """Maximization for several mappings (see :func:`maximize_batch`)"""
+        return [self.maximize(mapping) for mapping in mappings]
+
+
+def _skeleton(E, goal):
+    """The coordinates and the constraint matrix (with zero constants) for
+    maximization over a feasible set of cones"""
+    l = sum(len(A) for A in E)
     #print(goal)
     coordinates = list(frozenset.union(*(A.domain() for A in E)))
-    E = [[vector for vector in A] for A in E]
-    mat = Matrix([[0] + l * [0]], number_type='fraction')
-    mat.extend([[-h[x]] + [v[x] for A in E for v in A]
-                for x in coordinates], linear=True) # cone-constraints
-    mat.extend([[0] + [int(B == A and w == v) for B in E for w in B]
-                for A in E for v in A]) # mu >= 0
-    mat.obj_type = LPObjType.MAX
-    mat.obj_func = tuple([goal[0]] + [goal[1][v] for A in E for v in A])
-                      # (constant, mu)
+    rays = [[vector for vector in A] for A in E]
+    width = 1 + l
+    skeleton = _LinearProgram([width * [0]])
+    skeleton.extend(_cone_constraint_rows(rays, coordinates, width),
+                    linear=True) # cone-constraints
+    skeleton.extend(_unit_rows(width, range(1, width))) # mu >= 0
+    skeleton.objective = tuple([goal[0]] + [goal[1][v] for A in rays
+                                                       for v in A])
+                         # (constant, mu)
+    return coordinates, skeleton
+
+def _maximize(D, h, goal, backend, skeletons=None, E=None):
+    """Maximization using the CONEstrip algorithm proper (see
+    :func:`maximize`); constraint matrices are reused from and stored in
+    `skeletons` (keyed on the feasible set of cones) if given, and the
+    feasible set of cones is calculated unless it is given as `E`"""
+    if E is None:
+        E = feasible(D, h, backend)
+    if E == set():
+        raise ValueError("The linear program is infeasible.")
+        #print("The linear program is infeasible.")
+        #return 0
+    E = frozenset(E)
+    if skeletons is None or E not in skeletons:
+        coordinates, skeleton = _skeleton(E, goal)
+        if skeletons is not None:
+            skeletons[E] = (coordinates, skeleton)
+    else:
+        coordinates, skeleton = skeletons[E]
+    mat = _LinearProgram(skeleton.rows[:1])
+    mat.extend([[-h[x]] + row[1:] for x, row
+                in zip(coordinates, skeleton.rows[1:1 + len(coordinates)])],
+               linear=True) # cone-constraints, with h as constant
+    mat.extend(skeleton.rows[1 + len(coordinates):]) # mu >= 0
+    mat.objective = skeleton.objective
     #print(mat)
-    lp = LinProg(mat)
-    lp.solve()
-    if lp.status == LPStatusType.OPTIMAL:
-        #print(lp.primal_solution)
-        return lp.obj_value
-    elif lp.status == LPStatusType.UNDECIDED:
+    status, value, sol = backend.solve(mat)
+    if status == LPStatusType.OPTIMAL:
+        #print(sol)
+        return value
+    elif status == LPStatusType.UNDECIDED:
         status = "undecided"
-    elif lp.status == LPStatusType.INCONSISTENT:
+    elif status == LPStatusType.INCONSISTENT:
         status = "inconsistent"
-    elif lp.status == LPStatusType.UNBOUNDED:
+    elif status == LPStatusType.UNBOUNDED:
         status = "unbounded"
     else:
         status = "of unknown status"
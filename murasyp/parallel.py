@@ -0,0 +1,167 @@
+"""Parallel evaluation of queries using pools of worker processes
+
+Lower and upper previsions of many gambles with respect to a single model
+(a :class:`~murasyp.desirs.DesirSet` or a
+:class:`~murasyp.credalsets.CredalSet`) can be calculated by a
+:class:`ModelPool`, which ships the model to each worker only once. Queries
+that concern many different models, such as checking whether each of them
+avoids partial loss, can be distributed with :func:`map_models`.
+
+.. note::
+
+  On platforms where worker processes are spawned instead of forked, the
+  calling code must be importable by the workers (e.g., guarded by
+  ``if __name__ == '__main__':`` in scripts).
+
+"""
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+_model = None # the model of a ModelPool worker
+
+def _initialize(pickled_model):
+    """Unpickle the model in a worker"""
+    global _model
+    _model = pickle.loads(pickled_model)
+
+def _apply(method, chunk):
+    """Apply a method of the worker's model to each argument of a chunk"""
+    method = getattr(_model, method)
+    return [method(arg) for arg in chunk]
+
+def _apply_batch(method, chunk):
+    """Apply a batch method of the worker's model to a chunk of arguments"""
+    return getattr(_model, method)(chunk)
+
+def _call(method, model):
+    """Call a method (without arguments) of a model"""
+    return getattr(model, method)()
+
+def _chunks(args, chunksize):
+    """Split a list into consecutive chunks of a given size"""
+    return [args[i:i + chunksize] for i in range(0, len(args), chunksize)]
+
+
+class ModelPool(object):
+    """A pool of worker processes answering queries about a single model
+
+      :arg `model`: the model that is queried
+      :type `model`: a :class:`~murasyp.desirs.DesirSet` or
+        :class:`~murasyp.credalsets.CredalSet`
+      :arg `max_workers`: the number of worker processes (by default, the
+        number of processors)
+      :type `max_workers`: :class:`int`
+      :arg `chunksize`: the number of queries sent to a worker at once
+      :type `chunksize`: :class:`int`
+
+    The model is pickled once and unpickled once in each worker, when that
+    worker starts; only its contents are pickled, not what it keeps from
+    earlier calculations. Later changes to the model are not seen by the
+    workers.
+
+    >>> D = DesirSet([[Gamble({'a': -1, 'c': '7/90'}),
+    ...                Gamble({'a': 1, 'c': '-1/30'}),
+    ...                Gamble({'a': -1, 'c': '1/9', 'b': -1}),
+    ...                Gamble({'a': 1, 'c': '-1/9', 'b': 1})]])
+    >>> f = Gamble({'a': -1, 'b': 1, 'c': 0})
+    >>> with ModelPool(D, max_workers=2) as pool:
+    ...     pool.lower_previsions([f, f | f.support()])
+    ...     pool.upper_previsions([f, f | f.support()])
+    [Fraction(-1, 25), Fraction(-2, 5)]
+    [Fraction(1, 25), Fraction(2, 5)]
+
+    """
+    def __init__(self, model, max_workers=None, chunksize=1):
+        self.model = model
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(
+                            max_workers, initializer=_initialize,
+                            initargs=(pickle.dumps(model,
+                                                   pickle.HIGHEST_PROTOCOL),))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self, wait=True):
+        """Stop the worker processes"""
+        self._executor.shutdown(wait)
+
+    def map(self, method, args, batch=False):
+        """Apply a method of the model to each of a number of arguments
+
+          :arg `method`: the name of the method, e.g., ``'__mul__'``
+          :type `method`: :class:`str`
+          :arg `args`: the arguments
+          :type `args`: an :class:`~collections.Iterable`
+          :arg `batch`: whether the method takes a list of arguments and
+            returns a list of results (such as
+            :meth:`~murasyp.desirs.DesirSet.lower_previsions`)
+          :type `batch`: :class:`bool`
+          :returns: the results, in the order of the arguments
+          :rtype: :class:`list`
+
+        """
+        futures = [self._executor.submit(_apply_batch if batch else _apply,
+                                         method, chunk)
+                   for chunk in _chunks(list(args), self.chunksize)]
+        return [result for future in futures for result in future.result()]
+
+    def lower_previsions(self, gambles):
+        """Lower previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of
+            :class:`~murasyp.gambles.Gamble`
+          :rtype: :class:`list`
+
+        """
+        if hasattr(self.model, 'lower_previsions'):
+            return self.map('lower_previsions', gambles, batch=True)
+        else:
+            return self.map('__mul__', gambles)
+
+    def upper_previsions(self, gambles):
+        """Upper previsions (expectations) of several gambles
+
+          :type `gambles`: an :class:`~collections.Iterable` of
+            :class:`~murasyp.gambles.Gamble`
+          :rtype: :class:`list`
+
+        """
+        if hasattr(self.model, 'upper_previsions'):
+            return self.map('upper_previsions', gambles, batch=True)
+        else:
+            return self.map('__pow__', gambles)
+
+
+def map_models(method, models, max_workers=None, chunksize=1):
+    """Call a method without arguments on each of a number of models
+
+      :arg `method`: the name of the method, e.g., ``'apl'`` or
+        ``'get_credal'``
+      :type `method`: :class:`str`
+      :arg `models`: the models
+      :type `models`: an :class:`~collections.Iterable`
+      :arg `max_workers`: the number of worker processes (by default, the
+        number of processors)
+      :type `max_workers`: :class:`int`
+      :arg `chunksize`: the number of models sent to a worker at once
+      :type `chunksize`: :class:`int`
+      :returns: the results, in the order of the models
+      :rtype: :class:`list`
+
+    >>> D = DesirSet()
+    >>> D.add([{'a': -1, 'b': -1, 'c': 1}])
+    >>> E = DesirSet(D)
+    >>> E.add([{'a': -1, 'b': 1, 'c': -1}])
+    >>> map_models('apl', [D, E], max_workers=2)
+    [True, False]
+
+    """
+    models = list(models)
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(_call, repeat(method, len(models)), models,
+                                 chunksize=chunksize))
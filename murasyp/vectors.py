@@ -1,6 +1,65 @@
 from __future__ import division
 from collections import Set, Hashable, Mapping, MutableMapping
-from murasyp.functions import Function
+from fractions import Fraction
+from murasyp.functions import Function, _common_denominator
+
+class PossibilitySpace(frozenset):
+    """A frozenset of states with a fixed enumeration
+
+      :type `data`: a non-:class:`~collections.Mapping`
+        :class:`~collections.Iterable` of :class:`~collections.Hashable`
+        states; duplicates are ignored and the order of first occurrence
+        determines the enumeration.
+
+      >>> S = PossibilitySpace(['b', 'a', 'c', 'a'])
+      >>> assert S == frozenset({'a', 'b', 'c'})
+      >>> S.states
+      ('b', 'a', 'c')
+      >>> S.index('c')
+      2
+
+    A possibility space can be shared between vectors, so that their values
+    can be stored in and manipulated as integer arrays (lists) in which each
+    state always has the same position; see :meth:`Vector.array` and
+    :meth:`Vector.from_array`.
+
+    This class derives from :class:`~frozenset`, so its methods apply here as
+    well.
+
+    """
+    def __new__(cls, data=[]):
+        """Create a possibility space"""
+        if isinstance(data, Mapping):
+            raise TypeError(str(cls) + " does not accept a mapping,"
+                            + " but you passed it " + str(data))
+        index = {}
+        states = []
+        for state in data:
+            if state not in index:
+                index[state] = len(states)
+                states.append(state)
+        pspace = frozenset.__new__(cls, states)
+        pspace._states = tuple(states)
+        pspace._index = index
+        return pspace
+
+    def __init__(self, data=[]): # only here for Sphinx to pick up the argument
+        """Initialize the possibility space"""
+        pass
+
+    @property
+    def states(self):
+        """The states in enumeration order (a :class:`tuple`)"""
+        return self._states
+
+    def index(self, state):
+        """The position of a state in the enumeration
+
+          :rtype: :class:`int`
+
+        """
+        return self._index[state]
+
 
 class Vector(Function, Hashable):
     """Vectors map arguments to zero or a specified rational value
@@ -20,6 +79,13 @@ class Vector(Function, Hashable):
       TypeError: unhashable type: 'Function'
       >>> assert {Vector({})} == {Vector({})}
 
+      The hash is computed only once and does not depend on the order in which
+      the values were specified.
+
+      >>> assert (
+      ...     hash(Vector({'a': 1, 'b': 2})) == hash(Vector({'b': 2, 'a': 1}))
+      ... )
+
     * Unspecified values are assumed to be zero.
 
       >>> f = Vector({'a': 1.1, 'b': '-1/2','c': 0})
@@ -45,10 +111,18 @@ class Vector(Function, Hashable):
 
     """
 
+    __slots__ = ('_hash',)
+
     __getitem__ = lambda self, x: (self._mapping[x] if x in self
                                                     else self._make_rational(0))
-    __hash__ = lambda self: hash(tuple(item for item
-                                            in self._mapping.items()))
+    __hash__ = lambda self: self._cached('_hash', lambda: hash(
+                                            frozenset(self._mapping.items())))
+
+    def __eq__(self, other):
+        if isinstance(other, Vector) and hash(self) != hash(other):
+            return False
+        else:
+            return Function.__eq__(self, other)
 
     _domain_joiner = lambda self, other: iter(self.domain() | other.domain())
 
@@ -59,6 +133,47 @@ class Vector(Function, Hashable):
         else:
             raise TypeError("the argument must be a Set")
 
+    def array(self, pspace):
+        """Integer array representation of the vector
+
+          :arg `pspace`: the possibility space over which the array is taken
+          :type `pspace`: :class:`~murasyp.vectors.PossibilitySpace`
+          :returns: the numerators of the vector's values for the states of
+            `pspace`, in its enumeration order, and their common denominator
+          :rtype: a pair (:class:`tuple`) of a :class:`list` of :class:`int`
+            and an :class:`int`
+
+        >>> S = PossibilitySpace(['a', 'b', 'c'])
+        >>> Vector({'a': '1/2', 'b': '-1/3'}).array(S)
+        ([3, -2, 0], 6)
+
+        """
+        return _common_denominator(self[x] for x in pspace.states)
+
+    @classmethod
+    def from_array(cls, pspace, numerators, denominator=1):
+        """Create a vector from an integer array representation
+
+          :arg `pspace`: the possibility space over which the array is taken
+          :type `pspace`: :class:`~murasyp.vectors.PossibilitySpace`
+          :arg `numerators`: the numerators of the values, in the enumeration
+            order of `pspace`
+          :type `numerators`: a :class:`~collections.Sequence` of :class:`int`
+          :arg `denominator`: the common denominator of the values
+          :type `denominator`: :class:`int`
+          :returns: the vector with domain `pspace` and the given values
+          :rtype: an instance of the class on which it is called
+
+        >>> S = PossibilitySpace(['a', 'b', 'c'])
+        >>> assert (
+        ...     Vector.from_array(S, [3, -2, 0], 6) ==
+        ...     Vector({'a': '1/2', 'b': '-1/3', 'c': 0})
+        ... )
+
+        """
+        return cls({x: Fraction(n, denominator)
+                    for x, n in zip(pspace.states, numerators)})
+
     def mass(self):
         """Sum of the values of the vector
 
@@ -69,7 +184,8 @@ class Vector(Function, Hashable):
         Fraction(1, 2)
 
         """
-        return sum(self._mapping.values())
+        numerators, denominator = _common_denominator(self._mapping.values())
+        return Fraction(sum(numerators), denominator)
 
     def sum_normalized(self):
         """'Sum-of-values'-normalized version of the vector
@@ -90,8 +206,10 @@ class Vector(Function, Hashable):
           zero.
 
         """
-        mass = self.mass()
-        return None if mass == 0 else self / mass
+        numerators, denominator = _common_denominator(self._mapping.values())
+        mass = sum(numerators)
+        return (None if mass == 0 else
+                self._from_integer_form(self._mapping.keys(), numerators, mass))
 
     def is_nonnegative(self):
         """Checks whether all values are nonnegative
@@ -105,7 +223,7 @@ class Vector(Function, Hashable):
         True
 
         """
-        return all(val >= 0 for val in self._mapping.values())
+        return all(val.numerator >= 0 for val in self._mapping.values())
 
 
 class Polytope(frozenset):
@@ -179,12 +297,25 @@ class Trafo(MutableMapping):
       >>> P = Polytope({Vector({'a': -2})})
       >>> assert T << P == Polytope({Vector({('a', 'd'): -2, ('a', 'c'): -2})})
 
+      The transformation is compiled once into a sparse matrix with integer
+      entries over a common denominator, which is then used for all
+      applications until the transformation is modified.
+
+    * Transformations can be composed using the ``@`` operator; the product
+      is computed once, so that applying it takes a single pass:
+
+      >>> S = Trafo({('a', 'c'): {'x': 1}, ('a', 'd'): {'x': -1, 'y': '1/2'},
+      ...            ('b', 'c'): {'y': 1}, ('b', 'd'): {'y': 2}})
+      >>> v = Vector({'a': 1, 'b': 2})
+      >>> assert (S @ T) << v == S << (T << v) == Vector({'x': 0, 'y': '13/2'})
+
     """
     def __init__(self, mapping={}):
         """Create a transformation"""
         if isinstance(mapping, Mapping):
             self._mapping = {arg: Vector(value)
                              for arg, value in mapping.items()}
+            self._compiled = None
         else:
             raise TypeError("specify a mapping")
 
@@ -195,16 +326,65 @@ class Trafo(MutableMapping):
 
     def __setitem__(self, element, value):
         self._mapping.__setitem__(element, Vector(value))
+        self._compiled = None
 
     def __delitem__(self, element):
         mapping = self._mapping
         del mapping[element]
+        self._compiled = None
+
+    def _compile(self):
+        """Sparse integer-scaled matrix form of the transformation
+
+          :returns: the possibility space of the targets, a mapping of
+            arguments to their row (a pair of tuples with target indices and
+            integer entries), and the common denominator of all entries
+
+        """
+        if self._compiled is None:
+            targets = PossibilitySpace(y for vector in self._mapping.values()
+                                         for y in vector)
+            args = list(self._mapping.keys())
+            entries = [value for arg in args
+                             for value in self._mapping[arg].values()]
+            numerators, denominator = _common_denominator(entries)
+            numerators = iter(numerators)
+            rows = {}
+            for arg in args:
+                vector = self._mapping[arg]
+                rows[arg] = (tuple(targets.index(y) for y in vector),
+                             tuple(next(numerators) for y in vector))
+            self._compiled = (targets, rows, denominator)
+        return self._compiled
+
+    def _apply(self, vector):
+        """Apply the compiled transformation to a single vector"""
+        targets, rows, denominator = self._compile()
+        numerators, vector_denominator = _common_denominator(
+                                                    vector._mapping.values())
+        totals = {}
+        for arg, numerator in zip(vector._mapping.keys(), numerators):
+            indices, entries = rows[arg]
+            for index, entry in zip(indices, entries):
+                totals[index] = totals.get(index, 0) + numerator * entry
+        denominator *= vector_denominator
+        states = targets.states
+        return Vector({states[index]: Fraction(total, denominator)
+                       for index, total in totals.items()})
 
     def __lshift__(self, other):
         """Applying the transformation"""
         if isinstance(other, Vector):
-            return sum(value * self[arg] for arg, value in other.items())
+            return self._apply(other)
         if isinstance(other, Set):
             return type(other)(self << x for x in other)
         else:
             raise TypeError("the argument must be a Vector or a (nested) Set thereof")
+
+    def __matmul__(self, other):
+        """Composition of transformations"""
+        if isinstance(other, Trafo):
+            return type(self)({arg: self._apply(vector)
+                               for arg, vector in other.items()})
+        else:
+            return NotImplemented
@@ -25,7 +25,8 @@ Intended Audience :: End Users/Desktop
 Intended Audience :: Science/Research
 Topic :: Scientific/Engineering :: Mathematics
 Programming Language :: Python
-Programming Language :: Python :: 2
+Programming Language :: Python :: 3
+Programming Language :: Python :: 3 :: Only
 Operating System :: OS Independent"""
 
 from setuptools import setup, find_packages
@@ -53,4 +54,5 @@ setup(
     url="https://github.com/equaeghe/murasyp/",
     classifiers = classifiers.split('\n'),
     install_requires=requires,
+    python_requires=">=3.7",
 )